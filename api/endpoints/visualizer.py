@@ -1,7 +1,5 @@
-import os
-
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import Response
 
 from api.endpoints.analysis import get_analysis_service
 from api.schemas.analysis_schemas import ProgressionAnalysisRequest
@@ -33,7 +31,7 @@ async def visualize_progression(
     request: ProgressionAnalysisRequest,
     analysis_service: TonalAnalysisService = Depends(get_analysis_service),
     visualizer_service: VisualizerService = Depends(get_visualizer_service),
-) -> FileResponse:
+) -> Response:
     """
     Receives a list of chords, analyzes the progression and returns a
     visual diagram of the analysis.
@@ -47,14 +45,11 @@ async def visualize_progression(
         raise HTTPException(status_code=400, detail=error_detail)
 
     try:
-        image_path = visualizer_service.create_graph_from_analysis(
+        image_bytes = visualizer_service.create_graph_from_analysis(
             analysis_result, theme_mode=request.theme or "light"
         )
 
-        if not os.path.exists(image_path):
-            raise HTTPException(status_code=500, detail=T("errors.image_not_found"))
-
-        return FileResponse(image_path, media_type="image/png")
+        return Response(content=image_bytes, media_type="image/png")
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from api.schemas.analysis_schemas import (
@@ -17,6 +18,10 @@ from core.logic.progression_analyzer import ProgressionAnalyzer
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Chords are immutable, so requests naming the same chord share one instance, along with the
+# notes it has already parsed.
+_make_chord = lru_cache(maxsize=256)(Chord)
+
 
 class TonalAnalysisService:
     """
@@ -52,7 +57,7 @@ class TonalAnalysisService:
                     error=T("errors.chord_list_empty"),
                 )
 
-            input_chords: List[Chord] = [Chord(c) for c in request.chords]
+            input_chords: List[Chord] = [_make_chord(c) for c in request.chords]
 
             initial_tonalities_to_test: List[Tonality]
             if request.tonalities_to_test:
@@ -9,6 +9,16 @@ from api.schemas.analysis_schemas import ExplanationStepAPI, ProgressionAnalysis
 from core.i18n import T, translate_tonality
 from core.i18n.locale_manager import locale_manager
 
+# Translation key of the cadence formed by each pair of consecutive functions.
+CADENCE_KEYS: Dict[Tuple[str, str], str] = {
+    # Perfect cadence: Dominant → Tonic
+    ("DOMINANT", "TONIC"): "explanation.formatter.perfect_cadence_location",
+    # Plagal cadence: Subdominant → Tonic
+    ("SUBDOMINANT", "TONIC"): "explanation.formatter.plagal_cadence_location",
+    # Half cadence: Subdominant → Dominant (any chord → Dominant also ends a phrase on one)
+    ("SUBDOMINANT", "DOMINANT"): "explanation.formatter.half_cadence_location",
+}
+
 
 class ExplanationFormatter:
     """
@@ -354,56 +364,19 @@ class ExplanationFormatter:
         if len(chord_functions) < 2:
             return ""
 
-        functions = [func for _, func in chord_functions]
-        chords = [chord for chord, _ in chord_functions]
         cadences = []
+        last_pair = len(chord_functions) - 2
 
         # Check each pair of consecutive chords for cadential motion
-        for i in range(len(functions) - 1):
-            first_func = functions[i]
-            second_func = functions[i + 1]
-            first_chord = chords[i]
-            second_chord = chords[i + 1]
-
-            # Perfect cadence: Dominant → Tonic
-            if first_func == "DOMINANT" and second_func == "TONIC":
-                cadences.append(
-                    T(
-                        "explanation.formatter.perfect_cadence_location",
-                        first_chord=first_chord,
-                        second_chord=second_chord,
-                    )
-                )
-
-            # Plagal cadence: Subdominant → Tonic
-            elif first_func == "SUBDOMINANT" and second_func == "TONIC":
-                cadences.append(
-                    T(
-                        "explanation.formatter.plagal_cadence_location",
-                        first_chord=first_chord,
-                        second_chord=second_chord,
-                    )
-                )
-
-            # Half cadence: Subdominant → Dominant (or any chord → Dominant at phrase end)
-            elif second_func == "DOMINANT" and i == len(functions) - 2:
+        for i, ((first_chord, first_func), (second_chord, second_func)) in enumerate(
+            zip(chord_functions, chord_functions[1:])
+        ):
+            cadence_key = CADENCE_KEYS.get((first_func, second_func))
+            if cadence_key is None and second_func == "DOMINANT" and i == last_pair:
                 # Half cadence at the end of progression
-                cadences.append(
-                    T(
-                        "explanation.formatter.half_cadence_location",
-                        first_chord=first_chord,
-                        second_chord=second_chord,
-                    )
-                )
-            elif first_func == "SUBDOMINANT" and second_func == "DOMINANT":
-                # Half cadence in middle of progression
-                cadences.append(
-                    T(
-                        "explanation.formatter.half_cadence_location",
-                        first_chord=first_chord,
-                        second_chord=second_chord,
-                    )
-                )
+                cadence_key = "explanation.formatter.half_cadence_location"
+            if cadence_key is not None:
+                cadences.append(T(cadence_key, first_chord=first_chord, second_chord=second_chord))
 
         if cadences:
             # Connect multiple cadences with proper grammar
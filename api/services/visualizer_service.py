@@ -1,5 +1,4 @@
 import re
-import uuid
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -51,7 +50,7 @@ def _extract_pivot_target_tonality(step: ExplanationStepAPI) -> Optional[str]:
 class VisualizerService:
     def create_graph_from_analysis(
         self, analysis_data: ProgressionAnalysisResponse, theme_mode: ThemeMode = "light"
-    ) -> str:
+    ) -> bytes:
         if not analysis_data.is_tonal_progression:
             raise ValueError(T("errors.cannot_visualize_non_tonal"))
 
@@ -71,7 +70,6 @@ class VisualizerService:
             raw_tonality_name = tonality_name
 
         theme = get_theme_for_tonality(raw_tonality_name, theme_mode)
-        output_filename = TEMP_IMAGE_DIR / str(uuid.uuid4())
         graph = HarmonicGraph(theme=theme, temp_dir=TEMP_IMAGE_DIR)
 
         # Identify secondary tonalities used in the progression
@@ -388,7 +386,7 @@ class VisualizerService:
         main_ids = [n.node_id for n in main_world_nodes if n]
         graph.build_progression_chain(main_ids)
 
-        return graph.render(output_filename)
+        return graph.render_png()
 
     def get_graph_dot_source(
         self, analysis_data: ProgressionAnalysisResponse, theme_mode: ThemeMode = "light"
@@ -1,8 +1,13 @@
 import copy
 import re
+import sys
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+# Explanations create one step object per search step. Where dataclasses support it
+# (Python 3.10+), they are slotted so each step carries no instance __dict__.
+_SLOTTED: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 NOTE_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 NOTE_MAP = {name: i for i, name in enumerate(NOTE_NAMES)}
@@ -88,6 +93,11 @@ class Chord:
     name: str
     _notes_cache: Optional[Set[str]] = field(default=None, init=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # Names are interned so that the same chord from the knowledge base and from a request
+        # shares one string, and lookups keyed by chord name compare by identity.
+        object.__setattr__(self, "name", sys.intern(self.name))
+
     @property
     def quality(self) -> str:
         """Determines the chord's quality (Major, minor, diminished) from its name."""
@@ -161,6 +171,10 @@ class KripkeState:
     associated_tonal_function: TonalFunction
 
 
+# Number of chord names each Tonality remembers function masks for, see Tonality.function_mask().
+FUNCTION_MASK_CACHE_SIZE = 4096
+
+
 @dataclass
 class Tonality:
     """
@@ -171,6 +185,14 @@ class Tonality:
     tonality_name: str
     function_to_chords_map: Dict[TonalFunction, Dict[Chord, str]]
     primary_scale_notes: Set[str] = field(default_factory=set)
+    # Memoized function_mask() results per chord name.
+    _function_masks: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Interned like chord names, see Chord.
+        self.tonality_name = sys.intern(self.tonality_name)
 
     @property
     def quality(self) -> str:
@@ -179,6 +201,29 @@ class Tonality:
             return "minor"
         return "Major"
 
+    @property
+    def circle_of_fifths_position(self) -> Optional[int]:
+        """
+        Position of the tonality's key signature on the circle of fifths (0 for C Major and
+        A minor, 1 for G Major and E minor, ...), or None if the name has no known tonic.
+        """
+        tonic = normalize_note_name(self.tonality_name.split(" ")[0])
+        if tonic not in NOTE_MAP:
+            return None
+        # A minor key shares the signature of its relative major, a minor third above.
+        relative_major = NOTE_MAP[tonic] + (3 if self.quality == "minor" else 0)
+        return (relative_major * 7) % 12
+
+    def fifths_distance(self, other: "Tonality") -> int:
+        """
+        Number of steps between the key signatures of two tonalities on the circle of fifths,
+        from 0 (same or relative keys) to 6. Tonalities without a known tonic are 6 apart.
+        """
+        a, b = self.circle_of_fifths_position, other.circle_of_fifths_position
+        if a is None or b is None:
+            return 6
+        return min((a - b) % 12, (b - a) % 12)
+
     def get_chords_for_function(self, func: TonalFunction) -> Set[Chord]:
         """Returns the set of chords for a given tonal function."""
         return set(self.function_to_chords_map.get(func, {}).keys())
@@ -188,19 +233,34 @@ class Tonality:
         Checks if a chord fulfills a specific function in this tonality.
         This method supports enharmonic equivalence by comparing chord notes.
         """
-        function_chords = self.function_to_chords_map.get(target_function, {})
+        return bool(self.function_mask(test_chord) & (1 << target_function.value))
 
-        # First try direct comparison (for exact matches)
-        if test_chord in function_chords:
-            return True
-
-        # If no direct match, check for enharmonic equivalence by comparing notes
-        test_chord_notes = test_chord.notes
-        for chord in function_chords.keys():
-            if chord.notes == test_chord_notes:
-                return True
-
-        return False
+    def function_mask(self, chord: Chord) -> int:
+        """
+        Returns a bitmask with bit `1 << function.value` set for every function the chord
+        fulfills in this tonality (0 if none). Memoized per chord name on the tonality, so answers
+        are shared by every analysis that uses the same knowledge base. Chord names come from
+        requests, so the memo is emptied once it holds FUNCTION_MASK_CACHE_SIZE names instead of
+        growing for as long as the server runs.
+        """
+        mask = self._function_masks.get(chord.name)
+        if mask is None:
+            mask = 0
+            chord_notes: Optional[Set[str]] = None
+            for func, function_chords in self.function_to_chords_map.items():
+                # First try direct comparison (for exact matches)
+                if chord in function_chords:
+                    mask |= 1 << func.value
+                    continue
+                # If no direct match, check for enharmonic equivalence by comparing notes
+                if chord_notes is None:
+                    chord_notes = chord.notes
+                if any(c.notes == chord_notes for c in function_chords):
+                    mask |= 1 << func.value
+            if len(self._function_masks) >= FUNCTION_MASK_CACHE_SIZE:
+                self._function_masks.clear()
+            self._function_masks[chord.name] = mask
+        return mask
 
     def get_chord_origin_for_function(
         self, test_chord: Chord, target_function: TonalFunction
@@ -238,6 +298,16 @@ class KripkeStructureConfig:
         ]
 
 
+class PathStep(NamedTuple):
+    """One step of a KripkePath, linked to the step before it. Immutable, so paths share them."""
+
+    state: KripkeState
+    tonality: Tonality
+    # A description may be recorded as a callable that produces it; see `KripkePath.render()`.
+    explanation: Union[str, Callable[[], str]]
+    previous: Optional["PathStep"]
+
+
 @dataclass
 class KripkePath:
     """
@@ -247,58 +317,94 @@ class KripkePath:
     This class tracks the sequence of states and tonalities traversed during
     the analysis of a chord progression, providing a formal representation
     of the analytical path taken.
+
+    The steps form a persistent linked list that ends at `last_step`. Adding or removing a step
+    only moves that reference, so `clone()` is O(1) and clones share their common prefix.
     """
 
-    states: List[KripkeState] = field(default_factory=list)
-    tonalities: List[Tonality] = field(default_factory=list)
-    explanations: List[str] = field(default_factory=list)
+    last_step: Optional[PathStep] = None
+    length: int = 0
+
+    def _steps(self) -> List[PathStep]:
+        """Returns the steps of the path, oldest first."""
+        steps = []
+        step = self.last_step
+        while step is not None:
+            steps.append(step)
+            step = step.previous
+        steps.reverse()
+        return steps
 
-    def add_step(self, state: KripkeState, tonality: Tonality, explanation: str) -> None:
+    @property
+    def states(self) -> List[KripkeState]:
+        """The states of the path, oldest first."""
+        return [step.state for step in self._steps()]
+
+    @property
+    def tonalities(self) -> List[Tonality]:
+        """The tonalities of the path, oldest first."""
+        return [step.tonality for step in self._steps()]
+
+    @property
+    def explanations(self) -> List[Union[str, Callable[[], str]]]:
+        """The step descriptions of the path, oldest first."""
+        return [step.explanation for step in self._steps()]
+
+    def add_step(
+        self, state: KripkeState, tonality: Tonality, explanation: Union[str, Callable[[], str]]
+    ) -> None:
         """Add a step to the path."""
-        self.states.append(state)
-        self.tonalities.append(tonality)
-        self.explanations.append(explanation)
+        self.last_step = PathStep(state, tonality, explanation, self.last_step)
+        self.length += 1
+
+    def pop_step(self) -> None:
+        """Remove the last step, undoing the matching add_step."""
+        if self.last_step is None:
+            raise IndexError("pop from empty path")
+        self.last_step = self.last_step.previous
+        self.length -= 1
 
     def clone(self) -> "KripkePath":
-        """Create a deep copy of the path."""
-        return KripkePath(
-            states=self.states.copy(),
-            tonalities=self.tonalities.copy(),
-            explanations=self.explanations.copy(),
-        )
+        """Create a copy of the path. Steps are immutable, so the copy shares them."""
+        return KripkePath(last_step=self.last_step, length=self.length)
+
+    def render(self) -> "KripkePath":
+        """Materializes every deferred step description. Returns self for chaining."""
+        step: Optional[PathStep] = None
+        for old in self._steps():
+            explanation = old.explanation if isinstance(old.explanation, str) else old.explanation()
+            step = PathStep(old.state, old.tonality, explanation, step)
+        self.last_step = step
+        return self
 
     def get_current_state(self) -> Optional[KripkeState]:
         """Get the current (last) state in the path."""
-        if not self.states:
-            return None
-        return self.states[-1]
+        return self.last_step.state if self.last_step else None
 
     def get_current_tonality(self) -> Optional[Tonality]:
         """Get the current (last) tonality in the path."""
-        return self.tonalities[-1] if self.tonalities else None
+        return self.last_step.tonality if self.last_step else None
 
     def to_readable_format(self) -> str:
         """Convert path to readable format for debugging/logging."""
-        if not self.states:
+        if self.last_step is None:
             return "Empty path"
 
-        path_str = "Path: "
-        for i, (state, tonality) in enumerate(zip(self.states, self.tonalities)):
-            path_str += f"[{state.associated_tonal_function.name} in {tonality.tonality_name}]"
-            if i < len(self.states) - 1:
-                path_str += " → "
-        return path_str
+        return "Path: " + " → ".join(
+            f"[{step.state.associated_tonal_function.name} in {step.tonality.tonality_name}]"
+            for step in self._steps()
+        )
 
     def get_length(self) -> int:
         """Returns the length of the path (number of states)."""
-        return len(self.states)
+        return self.length
 
     def is_empty(self) -> bool:
         """Checks if the path is empty."""
-        return len(self.states) == 0
+        return self.last_step is None
 
 
-@dataclass
+@dataclass(**_SLOTTED)
 class DetailedExplanationStep:
     """Represents a single detailed step in the analysis explanation."""
 
@@ -308,13 +414,31 @@ class DetailedExplanationStep:
     formal_rule_applied: str
     observation: str
     pivot_target_tonality: Optional[Tonality] = None  # Target tonality for pivot modulations
+    # Produces the observation text on demand, so steps recorded on branches the search later
+    # abandons never pay for i18n formatting.
+    deferred_observation: Optional[Callable[[], str]] = field(
+        default=None, repr=False, compare=False
+    )
 
+    def render(self) -> None:
+        """Materializes a deferred observation into the `observation` field."""
+        if self.deferred_observation is not None:
+            self.observation = self.deferred_observation()
+            self.deferred_observation = None
 
-@dataclass
+
+@dataclass(**_SLOTTED)
 class Explanation:
-    """Collects a sequence of DetailedExplanationStep objects."""
+    """
+    Collects a sequence of DetailedExplanationStep objects.
+
+    An explanation may be chained to a `parent` whose steps precede its own. Chaining lets the
+    search extend an explanation in O(1) instead of cloning it; `flatten()` turns a chain back
+    into a single standalone explanation.
+    """
 
     steps: List[DetailedExplanationStep] = field(default_factory=list)
+    parent: Optional["Explanation"] = field(default=None, repr=False, compare=False)
 
     def add_step(
         self,
@@ -324,8 +448,14 @@ class Explanation:
         processed_chord: Optional[Chord] = None,
         tonality_used_in_step: Optional[Tonality] = None,
         pivot_target_tonality: Optional[Tonality] = None,
+        deferred_observation: Optional[Callable[[], str]] = None,
     ) -> None:
-        """Adds a new detailed step to the explanation."""
+        """
+        Adds a new detailed step to the explanation.
+
+        When `deferred_observation` is given, `observation` is left as a placeholder until
+        `render()` is called.
+        """
         step = DetailedExplanationStep(
             evaluated_functional_state,
             processed_chord,
@@ -333,9 +463,37 @@ class Explanation:
             formal_rule_applied,
             observation,
             pivot_target_tonality,
+            deferred_observation,
         )
         self.steps.append(step)
 
+    def render(self) -> "Explanation":
+        """Materializes every deferred observation. Returns self for chaining."""
+        for step in self.steps:
+            step.render()
+        return self
+
+    def branch(self) -> "Explanation":
+        """
+        Returns an empty explanation chained to this one. The parent's steps are shared, not
+        copied, so the parent must not be modified while the branch is in use.
+        """
+        return Explanation(parent=self)
+
+    def flatten(self) -> "Explanation":
+        """Returns a standalone explanation with the steps of the whole chain, oldest first."""
+        if self.parent is None:
+            return Explanation(steps=list(self.steps))
+        chain: List[List[DetailedExplanationStep]] = []
+        node: Optional[Explanation] = self
+        while node is not None:
+            chain.append(node.steps)
+            node = node.parent
+        return Explanation(steps=[step for steps in reversed(chain) for step in steps])
+
     def clone(self) -> "Explanation":
-        """Creates a deep copy of the Explanation object."""
-        return Explanation(steps=copy.deepcopy(self.steps))
+        """
+        Creates a copy of the Explanation whose steps can be modified independently. The chords,
+        states and tonalities the steps refer to are shared, not copied.
+        """
+        return Explanation(steps=[copy.copy(step) for step in self.flatten().steps])
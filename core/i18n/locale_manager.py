@@ -4,7 +4,7 @@ Locale Manager for handling language settings and detection.
 
 import os
 from contextlib import contextmanager
-from threading import local
+from contextvars import ContextVar
 from typing import Generator, Optional
 
 
@@ -15,21 +15,25 @@ class LocaleManager:
     SUPPORTED_LOCALES = {"en", "pt_br"}
 
     def __init__(self) -> None:
-        self._local = local()
-        self._local.current_locale = self.DEFAULT_LOCALE
+        # A context variable rather than a thread-local: async requests share the event loop's
+        # thread, but each runs in its own context, so a locale set by one does not leak into
+        # the next.
+        self._current_locale: ContextVar[str] = ContextVar(
+            "current_locale", default=self.DEFAULT_LOCALE
+        )
 
     @property
     def current_locale(self) -> str:
-        """Get the current locale for this thread."""
-        return getattr(self._local, "current_locale", self.DEFAULT_LOCALE)
+        """Get the current locale for this context."""
+        return self._current_locale.get()
 
     def set_locale(self, locale: str) -> None:
-        """Set the locale for current thread."""
+        """Set the locale for current context."""
         if locale in self.SUPPORTED_LOCALES:
-            self._local.current_locale = locale
+            self._current_locale.set(locale)
         else:
             # Fallback to default if unsupported locale
-            self._local.current_locale = self.DEFAULT_LOCALE
+            self._current_locale.set(self.DEFAULT_LOCALE)
 
     def get_locale_from_accept_language(self, accept_language: Optional[str]) -> str:
         """
@@ -4,7 +4,7 @@ Translation system for TonalogyAPI.
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from .locale_manager import locale_manager
 
@@ -18,10 +18,13 @@ class Translator:
 
         self.locales_dir = locales_dir
         self._translations: Dict[str, Dict[str, Any]] = {}
+        # (locale, key) -> template after fallbacks, so repeated keys skip the nested lookup.
+        self._templates: Dict[Tuple[str, str], str] = {}
         self._load_translations()
 
     def _load_translations(self) -> None:
         """Load all available translation files."""
+        self._templates.clear()
         if not self.locales_dir.exists():
             return
 
@@ -48,6 +51,23 @@ class Translator:
         if locale is None:
             locale = locale_manager.current_locale
 
+        translation = self._templates.get((locale, key))
+        if translation is None:
+            translation = self._resolve(key, locale)
+            self._templates[(locale, key)] = translation
+
+        # Nothing to substitute and no braces to unescape: the template is the message
+        if not kwargs and "{" not in translation and "}" not in translation:
+            return translation
+
+        # Format with provided variables
+        try:
+            return translation.format(**kwargs)
+        except (KeyError, ValueError):
+            return translation
+
+    def _resolve(self, key: str, locale: str) -> str:
+        """Find the template for a key, falling back to the default locale and then the key."""
         # Get translation from locale or fallback to default
         translation = self._get_nested_value(self._translations.get(locale, {}), key)
 
@@ -61,11 +81,7 @@ class Translator:
         if translation is None:
             translation = key
 
-        # Format with provided variables
-        try:
-            return translation.format(**kwargs)
-        except (KeyError, ValueError):
-            return translation
+        return translation
 
     def _get_nested_value(self, data: Dict[str, Any], key: str) -> Optional[str]:
         """Get value from nested dictionary using dot notation."""
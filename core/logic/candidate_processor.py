@@ -14,10 +14,7 @@ class CandidateProcessor:
 
     def _is_chord_in_tonality(self, tonality: Tonality, chord: Chord) -> bool:
         """Checks if a chord belongs to the harmonic field of a tonality."""
-        for function in TonalFunction:
-            if tonality.chord_fulfills_function(chord, function):
-                return True
-        return False
+        return tonality.function_mask(chord) != 0
 
     def _filter_by_final_tonic(
         self, last_chord: Chord, tonalities: List[Tonality]
@@ -29,7 +26,7 @@ class CandidateProcessor:
         return [
             tonality
             for tonality in tonalities
-            if tonality.chord_fulfills_function(last_chord, TonalFunction.TONIC)
+            if tonality.function_mask(last_chord) & (1 << TonalFunction.TONIC.value)
         ]
 
     def _rank_by_fit(
@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional, Tuple
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar, Union
 
 # Import the domain models we created previously
 from core.domain.models import (
@@ -17,6 +19,175 @@ from core.i18n.locale_manager import locale_manager
 MAX_RECURSION_DEPTH = 25  # Prevents infinite recursion in complex progressions
 MAX_PIVOT_CANDIDATES = 8  # Limits pivot exploration to most promising tonalities
 MAX_CONTINUATION_BRANCHES = 6  # Limits direct continuation paths to explore
+CHORD_TABLE_SIZE = 4096  # Limits the chord names each ChordTables table remembers
+
+# A candidate move of the search: the step to push onto the current path
+# (state, tonality, deferred path description) and the explanation that justifies it.
+Transition = Tuple[KripkeState, Tonality, Callable[[], str], Explanation]
+# Outcome of a subproblem: success flag, explanation and (on success) the winning path.
+SearchResult = Tuple[bool, Explanation, Optional[KripkePath]]
+
+
+def _chord_fulfills_function_observation(
+    chord: Chord, function: TonalFunction, tonality: Tonality
+) -> str:
+    locale = locale_manager.current_locale
+    return T(
+        "analysis.messages.chord_fulfills_function",
+        chord_name=chord.name,
+        function_name=translate_function(function.name, locale),
+        tonality_name=translate_tonality(tonality.tonality_name, locale),
+    )
+
+
+def _pivot_chord_observation(
+    chord: Chord,
+    functions_in_current: List[TonalFunction],
+    current_tonality: Tonality,
+    target_tonality: Tonality,
+    reinforced: bool,
+) -> str:
+    locale = locale_manager.current_locale
+    functions_str = (
+        ", ".join([translate_function(f.name, locale) for f in functions_in_current])
+        if functions_in_current
+        else "a transitional role"
+    )
+    return T(
+        "analysis.messages.pivot_chord_observation",
+        chord_name=chord.name,
+        functions_str=functions_str,
+        current_tonality=translate_tonality(current_tonality.tonality_name, locale),
+        target_tonality=translate_tonality(target_tonality.tonality_name, locale),
+        reinforcement_status=reinforced,
+    )
+
+
+def _reanchor_attempt_observation(chords: List[Chord], start: int) -> str:
+    return T(
+        "analysis.messages.reanchor_attempt_observation",
+        remaining_chords=[c.name for c in islice(chords, start, None)],
+    )
+
+
+def _direct_transition_description(state: KripkeState) -> str:
+    return T(
+        "analysis.rules.direct_transition",
+        function=translate_function(
+            state.associated_tonal_function.name, locale_manager.current_locale
+        ),
+    )
+
+
+def _transition_to_description(state: KripkeState, tonality: Tonality) -> str:
+    locale = locale_manager.current_locale
+    return T(
+        "analysis.rules.transition_to",
+        function=translate_function(state.associated_tonal_function.name, locale),
+        tonality=translate_tonality(tonality.tonality_name, locale),
+    )
+
+
+def _reanchoring_in_description(tonality: Tonality) -> str:
+    return T(
+        "analysis.rules.reanchoring_in",
+        tonality=translate_tonality(tonality.tonality_name, locale_manager.current_locale),
+    )
+
+
+# Observation and path-description formatters keyed by the message they render. Search steps only
+# record the key and the objects involved; the text is produced by Explanation.render() and
+# KripkePath.render() for what the search returns.
+OBSERVATION_FORMATTERS: Dict[str, Callable[..., str]] = {
+    "analysis.messages.chord_fulfills_function": _chord_fulfills_function_observation,
+    "analysis.messages.pivot_chord_observation": _pivot_chord_observation,
+    "analysis.messages.reanchor_attempt_observation": _reanchor_attempt_observation,
+    "analysis.rules.direct_transition": _direct_transition_description,
+    "analysis.rules.transition_to": _transition_to_description,
+    "analysis.rules.reanchoring_in": _reanchoring_in_description,
+}
+
+
+def _deferred_observation(message_key: str, *args: object) -> Callable[[], str]:
+    """Binds the formatter for `message_key` to its arguments without rendering it."""
+    return partial(OBSERVATION_FORMATTERS[message_key], *args)
+
+
+# Strategies of a search node, in the priority order in which their branches are tried.
+_DIRECT, _PIVOT, _REANCHOR = range(3)
+
+
+class _SearchFrame:
+    """
+    One open subproblem of the search: the chords from `start` on must be satisfied from the
+    current end of `path`. Holds the branches of the current strategy and the next one to try.
+    """
+
+    __slots__ = (
+        "path",
+        "start",
+        "depth",
+        "parent_explanation",
+        "cache_key",
+        "phase",
+        "branches",
+        "branch",
+        "reanchoring",
+        "tried_keys",
+    )
+
+    def __init__(
+        self,
+        path: KripkePath,
+        start: int,
+        depth: int,
+        parent_explanation: Explanation,
+        cache_key: Tuple,
+    ) -> None:
+        self.path = path
+        self.start = start
+        self.depth = depth
+        self.parent_explanation = parent_explanation
+        self.cache_key = cache_key
+        self.phase = _DIRECT
+        # Transitions of the current strategy, pulled and pushed onto `path` one at a time, and
+        # the one taken last (set by _next_child() before any child is opened).
+        self.branches: Iterator[Transition] = iter(())
+        self.branch: Transition
+        # Set when this frame re-anchors its tail, together with the keys that failed so far.
+        self.reanchoring = False
+        self.tried_keys: List[Tuple] = []
+
+
+_Entry = TypeVar("_Entry")
+
+
+def _store_chord_entry(table: Dict[str, _Entry], chord_name: str, entry: _Entry) -> None:
+    """Stores an entry of a ChordTables table, emptying the table first if it is full."""
+    if len(table) >= CHORD_TABLE_SIZE:
+        table.clear()
+    table[chord_name] = entry
+
+
+class ChordTables:
+    """
+    Per-chord lookup tables of a SatisfactionEvaluator that only depend on the available
+    tonalities. Evaluators built over the same tonality objects can share one instance, so the
+    tables are filled once for all the analyses of a ProgressionAnalyzer.
+
+    The chord names come from requests, so each table is emptied once it holds CHORD_TABLE_SIZE
+    names instead of growing for as long as the analyzer lives.
+    """
+
+    __slots__ = ("tonics_containing", "dominants_containing", "tonalities_supporting")
+
+    def __init__(self) -> None:
+        # Pivot table: chord name -> tonalities where it is the tonic, and chord name -> ids of
+        # the tonalities where it is the dominant. Filled per chord spelling on first use.
+        self.tonics_containing: Dict[str, List[Tonality]] = {}
+        self.dominants_containing: Dict[str, Set[int]] = {}
+        # Chord name -> ids of the tonalities where the chord fulfills at least one function.
+        self.tonalities_supporting: Dict[str, Set[int]] = {}
 
 
 class SatisfactionEvaluator:
@@ -35,6 +206,12 @@ class SatisfactionEvaluator:
 
     The backtracking explores hypotheses incrementally and backtracks when a path leads to
     a dead end, making it suitable for the exponential search space while maintaining efficiency.
+
+    Every subproblem is a node (chord position, tonality, state) of the product graph of the
+    progression and the Kripke structure, and both solved and failed nodes are memoized. The
+    depth-first search therefore expands each node a bounded number of times (once, or twice for
+    the node a re-anchor restarts from), i.e. it is a dynamic program over that graph run in the
+    priority order above; that order decides which of several valid paths is reported.
     """
 
     def __init__(
@@ -42,6 +219,7 @@ class SatisfactionEvaluator:
         kripke_config: KripkeStructureConfig,
         all_available_tonalities: List[Tonality],
         original_tonality: Tonality,
+        chord_tables: Optional[ChordTables] = None,
     ) -> None:
         """
         Initializes the SatisfactionEvaluator.
@@ -50,18 +228,218 @@ class SatisfactionEvaluator:
             kripke_config: The base Kripke structure configuration (S, S0, SF, R).
             all_available_tonalities: A list of all tonalities known to the system.
             original_tonality: The main tonality of the analysis, used to prioritize re-anchoring.
+            chord_tables: Tables shared with other evaluators over the same tonality objects.
+                A fresh set is used if omitted.
         """
         self.kripke_config: KripkeStructureConfig = kripke_config
-        self.all_available_tonalities: List[Tonality] = all_available_tonalities
-        self.original_tonality: Tonality = original_tonality
+        # Tonalities are interned by name, so the search compares them with `is` and keys its
+        # tables by id(). Every tonality that enters the search goes through _intern_tonality().
+        self._tonalities_by_name: Dict[str, Tonality] = {}
+        self.all_available_tonalities: List[Tonality] = [
+            t for t in all_available_tonalities if self._intern_tonality(t) is t
+        ]
+        self.original_tonality: Tonality = self._intern_tonality(original_tonality)
+        # Available tonalities in the order re-anchoring tries them after the original one. Set per
+        # progression by evaluate_satisfaction_recursive(), see _order_by_affinity().
+        self._ordered_tonalities: List[Tonality] = self.all_available_tonalities
+        # Chord name -> re-anchor candidates, see _reanchor_candidates(). Reset with the order.
+        self._reanchor_candidates_of: Dict[str, List[Tonality]] = {}
+        # Likewise for states, which go through _intern_state(). The relation may hold states
+        # equal to, but not the same objects as, those of `states`; they are interned here, so
+        # every id()-keyed table below and the memo keys see one object per state.
+        self._states: Dict[KripkeState, KripkeState] = {s: s for s in kripke_config.states}
+        for source, target in kripke_config.accessibility_relation:
+            self._intern_state(source)
+            self._intern_state(target)
+        # The accessibility relation is static, so each state's successors are resolved once.
+        # Keyed by id(): hashing a frozen dataclass builds a tuple of its fields on every lookup.
+        self._successors: Dict[int, Tuple[KripkeState, ...]] = {
+            id(s): tuple(self._states[t] for t in kripke_config.get_successors_of_state(s))
+            for s in self._states.values()
+        }
+        # id(state) -> bit of the state's function in Tonality.function_mask().
+        self._function_bit: Dict[int, int] = {
+            id(s): 1 << s.associated_tonal_function.value for s in self._states.values()
+        }
+        # Translated rule names by message key, see _rule(). Reset for every search, whose locale
+        # is fixed while it runs.
+        self._rule_names: Dict[str, str] = {}
         # Cache for memoization to store results of subproblems and avoid re-computation.
-        self.cache: Dict[Tuple, Tuple[bool, Explanation, Optional[KripkePath]]] = {}
+        self.cache: Dict[Tuple, SearchResult] = {}
+        # Subproblems known to fail. Callers discard the explanation of a failed branch,
+        # so only the key is stored and a hit costs a set lookup instead of a clone.
+        self._failure_memo: Set[Tuple] = set()
+        # The Kripke configuration is immutable, so the state of each function is resolved once.
+        self._state_of: Dict[TonalFunction, Optional[KripkeState]] = {
+            func: kripke_config.get_state_by_tonal_function(func) for func in TonalFunction
+        }
+        self._tonic_state: Optional[KripkeState] = self._state_of[TonalFunction.TONIC]
+        # Per (tonality id, chord) list of the functions the chord fulfills. The search asks the
+        # same questions on many branches; the answers never change. The underlying bitmasks are
+        # memoized by the tonalities themselves, see Tonality.function_mask().
+        self._functions_of: Dict[Tuple[int, str], List[TonalFunction]] = {}
+        # Chord name -> tonalities, see ChordTables.
+        if chord_tables is None:
+            chord_tables = ChordTables()
+        self._tonics_containing = chord_tables.tonics_containing
+        self._dominants_containing = chord_tables.dominants_containing
+        self._tonalities_supporting = chord_tables.tonalities_supporting
+        # (chord name, current tonality id) -> pivot candidates, see _pivot_candidates(). Depends
+        # on the ranking, so it is reset whenever ranked_tonalities changes.
+        self._pivot_candidates_of: Dict[Tuple[str, int], List[Tonality]] = {}
+        # Cursors of the tails currently being re-anchored further up the stack.
+        self._reanchors_in_progress: Set[int] = set()
+        # Hash-consed chord tails: (first chord name, id of the rest of the tail) -> tail id, with
+        # 0 for the empty tail. Subproblem keys carry the id instead of a tuple of chord names.
+        self._tail_ids: Dict[Tuple[str, int], int] = {}
+
+    def _intern_tails(self, chords: List[Chord]) -> List[int]:
+        """Returns the id of every tail `chords[i:]`, indexed by i (the last entry is 0)."""
+        tail_ids = self._tail_ids
+        ids = [0] * (len(chords) + 1)
+        for i in range(len(chords) - 1, -1, -1):
+            key = (chords[i].name, ids[i + 1])
+            tail_id = tail_ids.get(key)
+            if tail_id is None:
+                tail_id = len(tail_ids) + 1
+                tail_ids[key] = tail_id
+            ids[i] = tail_id
+        return ids
+
+    def _intern_tonality(self, tonality: Tonality) -> Tonality:
+        """Returns the evaluator's tonality object with the name of `tonality`."""
+        return self._tonalities_by_name.setdefault(tonality.tonality_name, tonality)
+
+    def _intern_state(self, state: KripkeState) -> KripkeState:
+        """Returns the evaluator's state object equal to `state`."""
+        return self._states.setdefault(state, state)
+
+    def _rule(self, key: str) -> str:
+        """
+        Returns the translated name of a formal rule. Every explanation step records one, on
+        failed branches too, so each name is translated once per search instead of per step.
+        """
+        name = self._rule_names.get(key)
+        if name is None:
+            name = self._rule_names[key] = T(key)
+        return name
+
+    def _function_mask(self, tonality: Tonality, chord: Chord) -> int:
+        """Returns the bitmask of the functions the chord fulfills in the tonality (0 if none)."""
+        return tonality.function_mask(chord)
+
+    def _fulfills(self, tonality: Tonality, chord: Chord, function: TonalFunction) -> bool:
+        """Memoized `tonality.chord_fulfills_function(chord, function)`."""
+        return bool(self._function_mask(tonality, chord) & (1 << function.value))
+
+    def _functions_in(self, tonality: Tonality, chord: Chord) -> List[TonalFunction]:
+        """Returns every TonalFunction the chord fulfills in the tonality, in enum order."""
+        key = (id(tonality), chord.name)
+        functions = self._functions_of.get(key)
+        if functions is None:
+            mask = self._function_mask(tonality, chord)
+            functions = [func for func in TonalFunction if mask & (1 << func.value)]
+            self._functions_of[key] = functions
+        return functions
+
+    def _tonalities_with_tonic(self, chord: Chord) -> List[Tonality]:
+        """Returns the available tonalities where the chord is the tonic, in their original order."""
+        tonalities = self._tonics_containing.get(chord.name)
+        if tonalities is None:
+            tonalities = [
+                t
+                for t in self.all_available_tonalities
+                if self._fulfills(t, chord, TonalFunction.TONIC)
+            ]
+            _store_chord_entry(self._tonics_containing, chord.name, tonalities)
+        return tonalities
+
+    def _tonalities_with_dominant(self, chord: Chord) -> Set[int]:
+        """Returns the ids of the available tonalities where the chord is a dominant."""
+        ids = self._dominants_containing.get(chord.name)
+        if ids is None:
+            ids = {
+                id(t)
+                for t in self.all_available_tonalities
+                if self._fulfills(t, chord, TonalFunction.DOMINANT)
+            }
+            _store_chord_entry(self._dominants_containing, chord.name, ids)
+        return ids
+
+    def _tonalities_supporting_chord(self, chord: Chord) -> Set[int]:
+        """Returns the ids of the available tonalities where the chord has any function."""
+        ids = self._tonalities_supporting.get(chord.name)
+        if ids is None:
+            ids = {id(t) for t in self.all_available_tonalities if self._function_mask(t, chord)}
+            _store_chord_entry(self._tonalities_supporting, chord.name, ids)
+        return ids
+
+    def _pivot_candidates(self, chord: Chord, current_tonality: Tonality) -> List[Tonality]:
+        """
+        Returns the tonalities where the chord is the tonic, in the order pivots are tried.
+
+        Only those tonalities can host a pivot, so the candidates are drawn from the tonic index
+        instead of scanning every tonality. Tonalities outside the ranking come first, followed
+        by the ranked ones. Unranked tonalities of the current tonality's quality (when Major)
+        come first, then the closest keys on the circle of fifths: most modulations go to
+        closely related keys, so the first pivot tried is the likeliest to succeed. The list only
+        depends on the chord, the current tonality and the ranking, so it is built once per pair.
+        """
+        key = (chord.name, id(current_tonality))
+        candidates = self._pivot_candidates_of.get(key)
+        if candidates is not None:
+            return candidates
+
+        prefer_major = current_tonality.quality == "Major"
+
+        def closeness(t: Tonality) -> Tuple[bool, int, str]:
+            return (
+                prefer_major and t.quality != "Major",
+                current_tonality.fifths_distance(t),
+                t.tonality_name,
+            )
+
+        tonic_tonalities = self._tonalities_with_tonic(chord)
+        if not tonic_tonalities:
+            candidates = []
+        elif hasattr(self, "ranked_tonalities"):
+            ranked_ids = {id(r) for r in self.ranked_tonalities}
+            candidates = sorted(
+                (t for t in tonic_tonalities if id(t) not in ranked_ids), key=closeness
+            )
+
+            tonic_ids = {id(t) for t in tonic_tonalities}
+            seen_tonalities = set()
+            for tonality in self.ranked_tonalities:
+                if id(tonality) in tonic_ids and id(tonality) not in seen_tonalities:
+                    seen_tonalities.add(id(tonality))
+                    candidates.append(tonality)
+        else:
+            candidates = sorted(tonic_tonalities, key=closeness)
+        self._pivot_candidates_of[key] = candidates
+        return candidates
+
+    def _has_unexplained_chord(
+        self, chords: List[Chord], start: int, current_tonality: Optional[Tonality]
+    ) -> bool:
+        """
+        Tells whether some chord of `chords[start:]` has no function in any tonality the search
+        can reach. Every strategy consumes a chord only where it has a function (a pivot needs
+        it to be the tonic of the new tonality), so such a chord makes the whole search fail.
+        """
+        reachable = (self.original_tonality, current_tonality)
+        for chord in chords[start:]:
+            if not self._tonalities_supporting_chord(chord) and not any(
+                t is not None and self._function_mask(t, chord) for t in reachable
+            ):
+                return True
+        return False
 
     def _get_possible_continuations(
         self, p_chord: Chord, current_path: KripkePath, parent_explanation: Explanation
-    ) -> List[Tuple[KripkePath, Explanation]]:
+    ) -> List[Transition]:
         """
-        Generates a list of all possible valid paths and explanations for a direct continuation.
+        Generates a list of all possible valid transitions and explanations for a direct continuation.
         This corresponds to the first part of the disjunction in Aragão's Equation 4.
         """
         continuations = []
@@ -71,231 +449,138 @@ class SatisfactionEvaluator:
         if not current_tonality or not current_state:
             return []
 
+        successor_states = self._successors.get(id(current_state), ())
+        if not successor_states:
+            return []
+        # The functions of P in the current tonality are read once and tested bit by bit.
+        p_mask = self._function_mask(current_tonality, p_chord)
+        function_bit = self._function_bit
+
         # Check if the current chord (P) fulfills the function of the current state.
-        if current_tonality.chord_fulfills_function(
-            p_chord, current_state.associated_tonal_function
-        ):
-            explanation_for_P = parent_explanation.clone()
+        # This guard is evaluated once: when it holds, P is explained by the current state and
+        # every successor becomes a continuation; otherwise we fall back to the successors' own
+        # functions below.
+        if p_mask & function_bit[id(current_state)]:
+            explanation_for_P = parent_explanation.branch()
             explanation_for_P.add_step(
-                formal_rule_applied=T("analysis.rules.p_in_l"),
-                observation=T(
+                formal_rule_applied=self._rule("analysis.rules.p_in_l"),
+                observation="",
+                deferred_observation=_deferred_observation(
                     "analysis.messages.chord_fulfills_function",
-                    chord_name=p_chord.name,
-                    function_name=translate_function(
-                        current_state.associated_tonal_function.name, locale_manager.current_locale
-                    ),
-                    tonality_name=translate_tonality(
-                        current_tonality.tonality_name, locale_manager.current_locale
-                    ),
+                    p_chord,
+                    current_state.associated_tonal_function,
+                    current_tonality,
                 ),
                 evaluated_functional_state=current_state,
                 processed_chord=p_chord,
                 tonality_used_in_step=current_tonality,
             )
             # If it fits, generate a new potential path for each successor state.
-            for next_state in self.kripke_config.get_successors_of_state(current_state):
-                path_copy = current_path.clone()
-                path_copy.add_step(
-                    next_state,
-                    current_tonality,
-                    T(
-                        "analysis.rules.direct_transition",
-                        function=translate_function(
-                            next_state.associated_tonal_function.name, locale_manager.current_locale
-                        ),
-                    ),
-                )
-                continuations.append((path_copy, explanation_for_P.clone()))
+            for next_state in successor_states:
+                description = _deferred_observation("analysis.rules.direct_transition", next_state)
+                continuations.append((next_state, current_tonality, description, explanation_for_P))
+            return continuations
 
         # ADDITIONAL: Also check if the chord can fulfill any function in directly accessible states
         # This handles cases like s_d -> s_sd where the chord is SUBDOMINANT (not DOMINANT)
-        successor_states = self.kripke_config.get_successors_of_state(current_state)
         for next_state in successor_states:
-            # Skip if we already handled this through the current state logic above
-            if current_tonality.chord_fulfills_function(
-                p_chord, current_state.associated_tonal_function
-            ):
-                continue
-
             # Check if the chord fulfills the function required by this successor state
-            if current_tonality.chord_fulfills_function(
-                p_chord, next_state.associated_tonal_function
-            ):
-                explanation_for_P = parent_explanation.clone()
+            if p_mask & function_bit[id(next_state)]:
+                explanation_for_P = parent_explanation.branch()
                 explanation_for_P.add_step(
-                    formal_rule_applied=T("analysis.rules.p_in_l"),
-                    observation=T(
+                    formal_rule_applied=self._rule("analysis.rules.p_in_l"),
+                    observation="",
+                    deferred_observation=_deferred_observation(
                         "analysis.messages.chord_fulfills_function",
-                        chord_name=p_chord.name,
-                        function_name=translate_function(
-                            next_state.associated_tonal_function.name, locale_manager.current_locale
-                        ),
-                        tonality_name=translate_tonality(
-                            current_tonality.tonality_name, locale_manager.current_locale
-                        ),
+                        p_chord,
+                        next_state.associated_tonal_function,
+                        current_tonality,
                     ),
                     evaluated_functional_state=next_state,
                     processed_chord=p_chord,
                     tonality_used_in_step=current_tonality,
                 )
                 # Create path with transition to this state
-                path_copy = current_path.clone()
-                path_copy.add_step(
-                    next_state,
-                    current_tonality,
-                    T(
-                        "analysis.rules.direct_transition",
-                        function=translate_function(
-                            next_state.associated_tonal_function.name, locale_manager.current_locale
-                        ),
-                    ),
-                )
-                continuations.append((path_copy, explanation_for_P.clone()))
+                description = _deferred_observation("analysis.rules.direct_transition", next_state)
+                continuations.append((next_state, current_tonality, description, explanation_for_P))
 
         return continuations
 
     def _get_possible_pivots(
         self,
         p_chord: Chord,
-        phi_sub_sequence: List[Chord],
+        next_chord: Optional[Chord],
         current_path: KripkePath,
         parent_explanation: Explanation,
-    ) -> List[Tuple[KripkePath, Explanation]]:
+    ) -> Iterator[Transition]:
         """
-        Generates a list of all possible valid paths and explanations for pivot modulations.
+        Yields all possible valid transitions and explanations for pivot modulations.
         This corresponds to Aragão's Equation 5.
+
+        Transitions are produced lazily: the search stops pulling them once one of them leads to
+        a solution, so the explanations of the remaining candidates are never built. The state
+        of `current_path` is read on the first pull, before any branch is pushed onto it.
         """
-        pivots = []
         current_state = current_path.get_current_state()
         current_tonality = current_path.get_current_tonality()
-        new_tonic_state = self.kripke_config.get_state_by_tonal_function(TonalFunction.TONIC)
+        new_tonic_state = self._tonic_state
 
         if not current_tonality or not current_state or not new_tonic_state:
-            return []
-
-        # --- FIX START ---
-        # The list of tonalities to check for pivots must be comprehensive, but prioritized.
-        # We start with the ranked tonalities (if provided) and then add all others to ensure completeness.
-        tonalities_to_check: List[Tonality] = []
-        seen_tonalities = set()
-
-        # First, add the prioritized tonalities from the heuristic
-        if hasattr(self, "ranked_tonalities"):
-            ranked = list(self.ranked_tonalities)
-
-            # TONICIZATION PRIORITY: Ensure tonalities where the pivot chord is tonic are tested first
-            if p_chord:
-                # Find tonalities where P is tonic that aren't in ranked
-                tonic_tonalities = []
-                for tonality in self.all_available_tonalities:
-                    if tonality.chord_fulfills_function(
-                        p_chord, TonalFunction.TONIC
-                    ) and tonality.tonality_name not in [r.tonality_name for r in ranked]:
-                        tonic_tonalities.append(tonality)
-
-                # Sort tonic tonalities (major first in major context)
-                if current_tonality and current_tonality.quality == "Major":
-                    tonic_tonalities.sort(key=lambda t: (t.quality != "Major", t.tonality_name))
-
-                # Insert tonic tonalities at the beginning
-                ranked = tonic_tonalities + ranked
-
-            for tonality in ranked:
-                if tonality.tonality_name not in seen_tonalities:
-                    tonalities_to_check.append(tonality)
-                    seen_tonalities.add(tonality.tonality_name)
-
-        # Then, add any remaining tonalities to ensure the search is exhaustive
-        # TONICIZATION PRIORITY: Prioritize tonalities where the pivot chord is actually the tonic
-        remaining_tonalities = [
-            t for t in self.all_available_tonalities if t.tonality_name not in seen_tonalities
-        ]
-
-        # Sort remaining tonalities: put those where P is tonic first
-        if p_chord:
-            remaining_tonalities.sort(
-                key=lambda t: (
-                    not t.chord_fulfills_function(p_chord, TonalFunction.TONIC),  # Tonic first
-                    (
-                        t.quality != "Major"
-                        if current_tonality and current_tonality.quality == "Major"
-                        else False
-                    ),  # Major tonalities first in major context
-                    t.tonality_name,
-                )
-            )
-
-        for tonality in remaining_tonalities:
-            tonalities_to_check.append(tonality)
-            seen_tonalities.add(tonality.tonality_name)
+            return
+
+        # A pivot is stronger if it also has a function in the original tonality... This does not
+        # depend on the candidate, so it is a single mask test; the list is only built for pivots.
+        p_has_function_in_L = self._function_mask(current_tonality, p_chord) != 0
+        # ...or if the modulation is reinforced by the next chord (which should be the dominant of
+        # L'). When neither can hold, as for a last chord without a function in L, no candidate
+        # can be valid and the candidate list is not built at all.
+        reinforcing_ids = self._tonalities_with_dominant(next_chord) if next_chord else set()
+        if not p_has_function_in_L and not reinforcing_ids:
+            return
+
+        tonalities_to_check = self._pivot_candidates(p_chord, current_tonality)
+        if not tonalities_to_check:
+            return
+
+        # The pivot chord's functions in L do not depend on the candidate either.
+        p_functions_in_L = self._functions_in(current_tonality, p_chord)
+        # Find the correct state for the pivot chord's function in the current tonality
+        pivot_state = None
+        if p_functions_in_L:
+            # Use the first (primary) function of the pivot chord in the current tonality
+            pivot_state = self._state_of[p_functions_in_L[0]]
+        # Fallback to current_state if no specific function state found
+        if pivot_state is None:
+            pivot_state = current_state
+
+        # Every pivot lands on the new tonic, so its successors are the same for all candidates.
+        new_tonic_successors = self._successors.get(id(new_tonic_state), ())
 
         for l_prime_tonality in tonalities_to_check:
-            if l_prime_tonality.tonality_name == current_tonality.tonality_name:
+            if l_prime_tonality is current_tonality:
                 continue
-
-            # Check if the current chord can function as a tonic in the new tonality (L').
-            p_is_tonic_in_L_prime = l_prime_tonality.chord_fulfills_function(
-                p_chord, TonalFunction.TONIC
-            )
-            if not p_is_tonic_in_L_prime:
+            # The modulation must be confirmed by the next chord: one without a function in L'
+            # would have to leave L' straight away. Re-anchoring in L' reaches the same
+            # subproblems when that is really needed. A last chord has nothing to confirm it.
+            if next_chord is not None and not self._function_mask(l_prime_tonality, next_chord):
                 continue
 
-            # A pivot is stronger if it also has a function in the original tonality...
-            p_functions_in_L = [
-                func
-                for func in TonalFunction
-                if current_tonality.chord_fulfills_function(p_chord, func)
-            ]
-
-            # ...or if the modulation is reinforced by the next chord (which should be the dominant of L').
-            tonicization_reinforced = False
-            if phi_sub_sequence:
-                next_chord = phi_sub_sequence[0]
-                if l_prime_tonality.chord_fulfills_function(next_chord, TonalFunction.DOMINANT):
-                    tonicization_reinforced = True
+            tonicization_reinforced = id(l_prime_tonality) in reinforcing_ids
 
-            pivot_valid = p_is_tonic_in_L_prime and (
-                bool(p_functions_in_L) or tonicization_reinforced
-            )
+            pivot_valid = p_has_function_in_L or tonicization_reinforced
 
             if pivot_valid:
-                explanation_for_pivot = parent_explanation.clone()
-                functions_str = (
-                    ", ".join(
-                        [
-                            translate_function(f.name, locale_manager.current_locale)
-                            for f in p_functions_in_L
-                        ]
-                    )
-                    if p_functions_in_L
-                    else "a transitional role"
-                )
-
-                # Find the correct state for the pivot chord's function in the current tonality
-                pivot_state = None
-                if p_functions_in_L:
-                    # Use the first (primary) function of the pivot chord in the current tonality
-                    primary_function = p_functions_in_L[0]
-                    # Find the state that corresponds to this function
-                    pivot_state = self.kripke_config.get_state_by_tonal_function(primary_function)
-
-                # Fallback to current_state if no specific function state found
-                if pivot_state is None:
-                    pivot_state = current_state
-
+                explanation_for_pivot = parent_explanation.branch()
                 explanation_for_pivot.add_step(
-                    formal_rule_applied=T("analysis.rules.pivot_modulation"),
-                    observation=T(
+                    formal_rule_applied=self._rule("analysis.rules.pivot_modulation"),
+                    observation="",
+                    deferred_observation=_deferred_observation(
                         "analysis.messages.pivot_chord_observation",
-                        chord_name=p_chord.name,
-                        functions_str=functions_str,
-                        current_tonality=translate_tonality(
-                            current_tonality.tonality_name, locale_manager.current_locale
-                        ),
-                        target_tonality=translate_tonality(
-                            l_prime_tonality.tonality_name, locale_manager.current_locale
-                        ),
-                        reinforcement_status=tonicization_reinforced,
+                        p_chord,
+                        p_functions_in_L,
+                        current_tonality,
+                        l_prime_tonality,
+                        tonicization_reinforced,
                     ),
                     evaluated_functional_state=pivot_state,
                     processed_chord=p_chord,
@@ -303,111 +588,117 @@ class SatisfactionEvaluator:
                     pivot_target_tonality=l_prime_tonality,  # Add structured pivot target
                 )
                 # Generate a new potential path for each successor of the new tonic state.
-                for next_state in self.kripke_config.get_successors_of_state(new_tonic_state):
-                    path_copy = current_path.clone()
-                    path_copy.add_step(
-                        next_state,
-                        l_prime_tonality,
-                        T(
-                            "analysis.rules.transition_to",
-                            function=translate_function(
-                                next_state.associated_tonal_function.name,
-                                locale_manager.current_locale,
-                            ),
-                            tonality=translate_tonality(
-                                l_prime_tonality.tonality_name, locale_manager.current_locale
-                            ),
-                        ),
+                for next_state in new_tonic_successors:
+                    description = _deferred_observation(
+                        "analysis.rules.transition_to", next_state, l_prime_tonality
                     )
-                    pivots.append((path_copy, explanation_for_pivot.clone()))
+                    yield next_state, l_prime_tonality, description, explanation_for_pivot
 
-        return pivots
+    def _reanchor_candidates(self, chord: Chord) -> List[Tonality]:
+        """
+        Returns the tonalities to re-anchor a tail starting with `chord` in, original first.
 
-    def _try_reanchor(
-        self, remaining_chords: List[Chord], parent_explanation: Explanation, recursion_depth: int
-    ) -> Tuple[bool, Explanation, Optional[KripkePath]]:
+        A re-anchored tonality must explain the first chord of the tail. Where that chord has
+        no function, only the reinforced pivots remain, and those do not depend on the
+        re-anchored tonality: the original tonality (always tried first) already covers them.
         """
-        Attempts to satisfy the remaining sequence as a completely new problem.
-        This is the "safety net" of the algorithm, corresponding to the second part
+        candidates = self._reanchor_candidates_of.get(chord.name)
+        if candidates is None:
+            supporting_ids = self._tonalities_supporting_chord(chord)
+            original = self.original_tonality
+            candidates = [original] + [
+                k for k in self._ordered_tonalities if k is not original and id(k) in supporting_ids
+            ]
+            self._reanchor_candidates_of[chord.name] = candidates
+        return candidates
+
+    def _order_by_affinity(self, chords: List[Chord]) -> List[Tonality]:
+        """
+        Returns the available tonalities sorted by how many of `chords` have a function in them,
+        most first; ties keep their original order. Tonalities that explain more of the
+        progression are the likeliest to satisfy a re-anchored tail.
+        """
+        function_mask = self._function_mask
+        # Progressions repeat chords; each distinct chord is tested once and weighted by its count.
+        counts: Dict[str, int] = {}
+        distinct: List[Chord] = []
+        for chord in chords:
+            if chord.name not in counts:
+                counts[chord.name] = 0
+                distinct.append(chord)
+            counts[chord.name] += 1
+        affinity = {
+            id(t): sum(counts[c.name] for c in distinct if function_mask(t, c))
+            for t in self.all_available_tonalities
+        }
+        return sorted(self.all_available_tonalities, key=lambda t: -affinity[id(t)])
+
+    def _start_reanchor(
+        self, frame: _SearchFrame, remaining_chords: List[Chord]
+    ) -> List[Transition]:
+        """
+        Prepares the re-anchoring branches of a frame: the tail is satisfied as a completely new
+        problem. This is the "safety net" of the algorithm, corresponding to the second part
         of the disjunction in Aragão's Equation 4 (K,L ⊧π' φ).
+
+        Each branch starts at the tonic of a candidate tonality without consuming a chord. The
+        frame's `path` is replaced by a fresh one that all re-anchor branches are pushed onto.
+
+        A tail that is already being re-anchored further down the stack is not re-anchored again:
+        the outer frame tries every tonality for it anyway, at a shallower depth.
         """
-        explanation_before_reanchor = parent_explanation.clone()
+        start = frame.start
+        if start in self._reanchors_in_progress or not self._tonic_state:
+            return []
+
+        explanation_before_reanchor = frame.parent_explanation.branch()
         explanation_before_reanchor.add_step(
-            formal_rule_applied=T("analysis.rules.reanchor_attempt"),
-            observation=T(
-                "analysis.messages.reanchor_attempt_observation",
-                remaining_chords=[c.name for c in remaining_chords],
+            formal_rule_applied=self._rule("analysis.rules.reanchor_attempt"),
+            observation="",
+            deferred_observation=_deferred_observation(
+                "analysis.messages.reanchor_attempt_observation", remaining_chords, start
             ),
         )
-
-        tonalities_to_try = [self.original_tonality] + [
-            k
-            for k in self.all_available_tonalities
-            if k.tonality_name != self.original_tonality.tonality_name
-        ]
-        tonic_start_state = self.kripke_config.get_state_by_tonal_function(TonalFunction.TONIC)
-
-        if not tonic_start_state:
-            return False, parent_explanation, None
-
-        for l_star_tonality in tonalities_to_try:
-            reanchor_path = KripkePath()
-            reanchor_path.add_step(
+        frame.reanchoring = True
+        frame.path = KripkePath()
+        self._reanchors_in_progress.add(start)
+        tonic_start_state = self._tonic_state
+        return [
+            (
                 tonic_start_state,
                 l_star_tonality,
-                T(
-                    "analysis.rules.reanchoring_in",
-                    tonality=translate_tonality(
-                        l_star_tonality.tonality_name, locale_manager.current_locale
-                    ),
-                ),
+                _deferred_observation("analysis.rules.reanchoring_in", l_star_tonality),
+                explanation_before_reanchor,
             )
+            for l_star_tonality in self._reanchor_candidates(remaining_chords[start])
+        ]
 
-            # Recursive call to solve the subproblem.
-            success, final_explanation, final_path = self.evaluate_satisfaction_with_path(
-                reanchor_path, remaining_chords, recursion_depth + 1, explanation_before_reanchor
-            )
-            if success:
-                return True, final_explanation, final_path
-
-        return False, parent_explanation, None
-
-    def evaluate_satisfaction_with_path(
+    def _open_node(
         self,
         current_path: KripkePath,
         remaining_chords: List[Chord],
         recursion_depth: int,
         parent_explanation: Explanation,
-    ) -> Tuple[bool, Explanation, Optional[KripkePath]]:
+        start: int,
+        tail_id: int,
+    ) -> Union[SearchResult, _SearchFrame]:
         """
-        The main backtracking engine. It orchestrates the search for a valid solution.
-
-        BACKTRACKING ALGORITHM STRUCTURE:
-        1. **Memoization Check**: Return cached result if subproblem already solved
-        2. **Pruning**: Check depth limit and base cases for early termination
-        3. **Branch Generation**: Create possible continuations in priority order:
-           - Direct continuations (highest priority - most likely to succeed)
-           - Pivot modulations (medium priority - handle key changes)
-           - Re-anchoring (lowest priority - last resort for complex cases)
-        4. **Recursive Exploration**: For each branch, recursively solve remaining subproblem
-        5. **Early Success**: Return immediately when first valid path is found
-        6. **Backtrack**: If all branches fail, mark this subproblem as unsolvable
-
-        This approach transforms the exponential search space into a manageable exploration
-        by systematically pruning unsuccessful branches and caching solved subproblems.
+        Resolves a subproblem from the memo, the depth limit or the base case, or opens a frame
+        whose branches are tried by the search loop.
         """
         # --- PRUNING STRATEGY 1: Memoization (Dynamic Programming) ---
         # Check if this exact subproblem (state + tonality + remaining chords) has been solved before
         # This provides exponential speedup for progressions with repeated patterns
-        current_tonality_obj = current_path.get_current_tonality()
         cache_key = (
-            current_path.get_current_state(),
-            current_tonality_obj.tonality_name if current_tonality_obj else None,
-            tuple(c.name for c in remaining_chords),
+            id(current_path.get_current_state()),
+            id(current_path.get_current_tonality()),
+            tail_id,
         )
-        if cache_key in self.cache:
-            success, cached_exp, cached_path = self.cache[cache_key]
-            return success, cached_exp.clone(), cached_path.clone() if cached_path else None
+        if cache_key in self._failure_memo:
+            return False, parent_explanation, None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # --- PRUNING STRATEGY 2: Depth Limiting ---
         # Prevent infinite recursion and limit computational complexity
@@ -417,61 +708,176 @@ class SatisfactionEvaluator:
 
         # --- PRUNING STRATEGY 3: Base Case (Successful Termination) ---
         # If no more chords to process, we've found a complete valid path
-        if not remaining_chords:
-            final_explanation = parent_explanation.clone()
+        if start >= len(remaining_chords):
+            final_explanation = parent_explanation.branch()
             final_explanation.add_step(
                 formal_rule_applied=T("analysis.rules.end_of_sequence"),
                 observation=T("analysis.messages.end_of_sequence_observation"),
             )
-            return True, final_explanation, current_path
-
-        # --- BACKTRACKING: Generate and test branches in priority order ---
-        p_chord = remaining_chords[0]
-        phi_sub_sequence = remaining_chords[1:]
+            # The path is shared by the whole search and unwound on backtrack; freeze a copy.
+            return True, final_explanation, current_path.clone().render()
 
         # PRIORITY 1: Direct continuations (most likely to succeed)
         # These represent normal functional progressions within the current tonality
-        direct_continuations = self._get_possible_continuations(
-            p_chord, current_path, parent_explanation
-        )
-
-        # Test direct continuations first - early success terminates search
-        for path_after_p, explanation_for_p in direct_continuations:
-            success, final_explanation, final_path = self.evaluate_satisfaction_with_path(
-                path_after_p, phi_sub_sequence, recursion_depth + 1, explanation_for_p
+        frame = _SearchFrame(current_path, start, recursion_depth, parent_explanation, cache_key)
+        frame.branches = iter(
+            self._get_possible_continuations(
+                remaining_chords[start], current_path, parent_explanation
             )
-            if success:
-                # Cache successful result and return immediately
-                self.cache[cache_key] = (True, final_explanation, final_path)
-                return True, final_explanation, final_path
-
-        # PRIORITY 2: Pivot modulations (handle key changes)
-        # Only try if direct continuations failed - this reduces branching factor
-        pivots = self._get_possible_pivots(
-            p_chord, phi_sub_sequence, current_path, parent_explanation
         )
+        return frame
 
-        for path_after_p, explanation_for_p in pivots:
-            success, final_explanation, final_path = self.evaluate_satisfaction_with_path(
-                path_after_p, phi_sub_sequence, recursion_depth + 1, explanation_for_p
-            )
-            if success:
-                self.cache[cache_key] = (True, final_explanation, final_path)
-                return True, final_explanation, final_path
-
-        # PRIORITY 3: Re-anchoring (last resort for complex cases)
-        # This is the most expensive option, only used when all else fails
-        success_reanchor, explanation_reanchor, path_reanchor = self._try_reanchor(
-            remaining_chords, parent_explanation, recursion_depth
+    def _next_child(
+        self, frame: _SearchFrame, remaining_chords: List[Chord], tail_ids: List[int]
+    ) -> Union[SearchResult, _SearchFrame, None]:
+        """
+        Takes the next branch of a frame, moving on to the next strategy when the current one is
+        exhausted, and opens the subproblem it leads to. Returns None once every branch failed.
+        """
+        branch = next(frame.branches, None)
+        while branch is None:
+            if frame.phase == _DIRECT:
+                # PRIORITY 2: Pivot modulations (handle key changes)
+                # Only tried if direct continuations failed - this reduces branching factor
+                next_start = frame.start + 1
+                frame.phase = _PIVOT
+                frame.branches = self._get_possible_pivots(
+                    remaining_chords[frame.start],
+                    remaining_chords[next_start] if next_start < len(remaining_chords) else None,
+                    frame.path,
+                    frame.parent_explanation,
+                )
+            elif frame.phase == _PIVOT:
+                # PRIORITY 3: Re-anchoring (last resort for complex cases)
+                # This is the most expensive option, only used when all else fails
+                frame.phase = _REANCHOR
+                frame.branches = iter(self._start_reanchor(frame, remaining_chords))
+            else:
+                return None
+            branch = next(frame.branches, None)
+
+        frame.branch = branch
+        next_state, tonality, description, explanation_for_p = branch
+        frame.path.add_step(next_state, tonality, description)
+        # A re-anchor step lands on a tonic without consuming the chord it is re-anchored on.
+        next_start = frame.start if frame.phase == _REANCHOR else frame.start + 1
+        return self._open_node(
+            frame.path,
+            remaining_chords,
+            frame.depth + 1,
+            explanation_for_p,
+            next_start,
+            tail_ids[next_start],
         )
-        if success_reanchor:
-            self.cache[cache_key] = (True, explanation_reanchor, path_reanchor)
-            return True, explanation_reanchor, path_reanchor
 
-        # BACKTRACK: All strategies failed - cache failure and return
-        # This prevents re-exploring this failed subproblem
-        self.cache[cache_key] = (False, parent_explanation, None)
-        return False, parent_explanation, None
+    def _close_frame(self, frame: _SearchFrame, result: Optional[SearchResult]) -> SearchResult:
+        """Records the outcome of a finished frame; `result` is None when every branch failed."""
+        if frame.reanchoring:
+            self._reanchors_in_progress.discard(frame.start)
+        if result is None:
+            # BACKTRACK: All strategies failed - remember the failure
+            # This prevents re-exploring this failed subproblem
+            self._failure_memo.add(frame.cache_key)
+            return False, frame.parent_explanation, None
+        if frame.phase == _REANCHOR:
+            # Tonalities tried before the winning one failed only because the nested re-anchor
+            # was cut short; with re-anchoring they succeed, so forget those failures.
+            self._failure_memo.difference_update(frame.tried_keys)
+        self.cache[frame.cache_key] = result
+        return result
+
+    def evaluate_satisfaction_with_path(
+        self,
+        current_path: KripkePath,
+        remaining_chords: List[Chord],
+        recursion_depth: int,
+        parent_explanation: Explanation,
+        start: int = 0,
+    ) -> SearchResult:
+        """
+        The main backtracking engine. It orchestrates the search for a valid solution.
+
+        BACKTRACKING ALGORITHM STRUCTURE:
+        1. **Memoization Check**: Return cached result if subproblem already solved
+        2. **Pruning**: Check depth limit and base cases for early termination
+        3. **Branch Generation**: Create possible continuations in priority order:
+           - Direct continuations (highest priority - most likely to succeed)
+           - Pivot modulations (medium priority - handle key changes)
+           - Re-anchoring (lowest priority - last resort for complex cases)
+        4. **Depth-First Exploration**: For each branch, solve the remaining subproblem
+        5. **Early Success**: Return immediately when first valid path is found
+        6. **Backtrack**: If all branches fail, mark this subproblem as unsolvable
+
+        This approach transforms the exponential search space into a manageable exploration
+        by systematically pruning unsuccessful branches and caching solved subproblems.
+
+        The recursion of Aragão's definition is run on an explicit stack of `_SearchFrame`s, one
+        per open subproblem, instead of Python calls. The chords still to be processed by a
+        frame are `remaining_chords[start:]`; the list itself is shared and only the cursor moves.
+        Subproblems are keyed by (state id, tonality id, tail id), see `_intern_tails()`; the
+        path must hold the evaluator's own state and tonality objects (see `_intern_tonality()`).
+
+        Explanations are extended with `Explanation.branch()`, so the returned explanation may be
+        chained to its parents and share steps with other branches; call `flatten()` before
+        handing it out. The current path is extended in place for each branch and restored on
+        backtrack; a successful result carries its own copy of the winning path.
+        """
+        self._rule_names.clear()
+        # A chord no tonality explains can never be consumed; fail before searching.
+        if self._has_unexplained_chord(
+            remaining_chords, start, current_path.get_current_tonality()
+        ):
+            return False, parent_explanation, None
+
+        tail_ids = self._intern_tails(remaining_chords)
+        opened = self._open_node(
+            current_path,
+            remaining_chords,
+            recursion_depth,
+            parent_explanation,
+            start,
+            tail_ids[start],
+        )
+        if not isinstance(opened, _SearchFrame):
+            return opened
+
+        stack: List[_SearchFrame] = [opened]
+        next_child = self._next_child
+        close_frame = self._close_frame
+        result: Optional[SearchResult] = None
+        try:
+            while stack:
+                frame = stack[-1]
+                if result is not None:
+                    # The subproblem of the last branch taken by this frame has been resolved.
+                    frame.path.pop_step()
+                    if frame.phase == _REANCHOR and not result[0]:
+                        tried_tonality = frame.branch[1]
+                        frame.tried_keys.append(
+                            (id(self._tonic_state), id(tried_tonality), frame.cache_key[2])
+                        )
+                    if result[0]:
+                        # Early success terminates the search of this frame
+                        stack.pop()
+                        result = close_frame(frame, result)
+                        continue
+
+                child = next_child(frame, remaining_chords, tail_ids)
+                if child is None:
+                    stack.pop()
+                    result = close_frame(frame, None)
+                elif isinstance(child, _SearchFrame):
+                    stack.append(child)
+                    result = None
+                else:
+                    result = child
+        finally:
+            # Only reached with frames left if the search raised; do not leave tails marked.
+            if stack:
+                self._reanchors_in_progress.clear()
+
+        assert result is not None
+        return result
 
     def evaluate_satisfaction_recursive(
         self,
@@ -485,19 +891,24 @@ class SatisfactionEvaluator:
         """
         Wrapper method for backward compatibility. Creates the initial path and calls the main backtracking engine.
         """
+        current_tonality = self._intern_tonality(current_tonality)
         initial_path = KripkePath()
         initial_path.add_step(
-            current_state,
+            self._intern_state(current_state),
             current_tonality,
             f"Starting analysis in {current_tonality.tonality_name}",
         )
 
+        self._ordered_tonalities = self._order_by_affinity(remaining_chords)
+        self._reanchor_candidates_of.clear()
+
         # Pass the ranked tonalities to the evaluator instance for optimization.
         if ranked_tonalities:
-            self.ranked_tonalities = ranked_tonalities
+            self.ranked_tonalities = [self._intern_tonality(t) for t in ranked_tonalities]
+            self._pivot_candidates_of.clear()
 
         success, explanation, _ = self.evaluate_satisfaction_with_path(
             initial_path, remaining_chords, recursion_depth, parent_explanation
         )
 
-        return success, explanation
+        return success, explanation.flatten().render()
@@ -1,9 +1,20 @@
-from typing import List, Tuple
-
-from core.domain.models import Chord, Explanation, KripkeStructureConfig, TonalFunction, Tonality
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.domain.models import (
+    Chord,
+    Explanation,
+    KripkeState,
+    KripkeStructureConfig,
+    TonalFunction,
+    Tonality,
+)
 from core.i18n import T, translate_tonality
 from core.i18n.locale_manager import locale_manager
-from core.logic.kripke_evaluator import SatisfactionEvaluator
+from core.logic.kripke_evaluator import ChordTables, SatisfactionEvaluator
+
+# Number of analyses remembered by each ProgressionAnalyzer, see check_tonal_progression().
+RESULT_CACHE_SIZE = 256
 
 
 class ProgressionAnalyzer:
@@ -20,6 +31,17 @@ class ProgressionAnalyzer:
         """
         self.kripke_config = kripke_config
         self.all_available_tonalities = all_available_tonalities
+        # Every analysis starts in the tonic state; the configuration does not change.
+        self._initial_state: Optional[KripkeState] = kripke_config.get_state_by_tonal_function(
+            TonalFunction.TONIC
+        )
+        # Per-chord tables of the evaluators, shared by every analysis of this analyzer.
+        self._chord_tables = ChordTables()
+        # Finished analyses by (locale, chord names, tonality names), least recently used first.
+        # The API calls one analyzer from several worker threads, so every access to the cache
+        # holds the lock; the analysis itself runs without it.
+        self._results: Dict[Tuple, Tuple[bool, Explanation]] = {}
+        self._results_lock = threading.Lock()
 
     def check_tonal_progression(
         self, input_chord_sequence: List[Chord], tonalities_to_test: List[Tonality]
@@ -31,7 +53,42 @@ class ProgressionAnalyzer:
 
         Uses backtracking with intelligent pruning strategies to handle
         the NP-complete nature of Kripke structure navigation efficiently.
+
+        The analysis only depends on the chords, the tonalities to test and the locale the
+        explanation is written in, so the RESULT_CACHE_SIZE most recently used results are
+        remembered and repeated requests are answered without searching again.
         """
+        key = (
+            locale_manager.current_locale,
+            tuple(chord.name for chord in input_chord_sequence),
+            tuple(tonality.tonality_name for tonality in tonalities_to_test),
+        )
+        # Re-inserting moves an entry to the end, so eviction drops the least recently used.
+        with self._results_lock:
+            cached = self._results.pop(key, None)
+            if cached is not None:
+                self._results[key] = cached
+        if cached is None:
+            cached = self._analyze(input_chord_sequence, tonalities_to_test)
+            with self._results_lock:
+                # Another thread may have stored the same analysis meanwhile.
+                self._results.pop(key, None)
+                if len(self._results) >= RESULT_CACHE_SIZE:
+                    del self._results[next(iter(self._results))]
+                self._results[key] = cached
+        success, explanation = cached
+        # Callers may extend the explanation; keep the remembered one untouched.
+        return success, explanation.clone()
+
+    def clear_cache(self) -> None:
+        """Forgets every remembered analysis."""
+        with self._results_lock:
+            self._results.clear()
+
+    def _analyze(
+        self, input_chord_sequence: List[Chord], tonalities_to_test: List[Tonality]
+    ) -> Tuple[bool, Explanation]:
+        """Runs the analysis behind check_tonal_progression()."""
         failure_explanation = Explanation()
         if not input_chord_sequence:
             failure_explanation.add_step(
@@ -60,19 +117,7 @@ class ProgressionAnalyzer:
         # PRUNING STRATEGY 1: Start with most likely tonality (heuristic ordering)
         primary_tonality = tonalities_to_test[0]
 
-        # Create the evaluator ONCE with the fixed primary (original) tonality.
-        # The evaluator uses multiple pruning techniques:
-        # - Memoization (Dynamic Programming) to avoid recomputing subproblems
-        # - Depth limiting to prevent infinite recursion
-        # - Priority ordering (direct continuation > pivot > re-anchoring)
-        evaluator = SatisfactionEvaluator(
-            self.kripke_config, self.all_available_tonalities, primary_tonality
-        )
-
-        # PRUNING STRATEGY 2: Reverse analysis (work backwards from cadential goal)
-        # This significantly reduces the search space by starting from the resolution
-        reversed_chord_sequence = list(reversed(input_chord_sequence))
-        initial_state = self.kripke_config.get_state_by_tonal_function(TonalFunction.TONIC)
+        initial_state = self._initial_state
 
         if not initial_state:
             failure_explanation.add_step(
@@ -84,18 +129,42 @@ class ProgressionAnalyzer:
         # PRUNING STRATEGY 3: Hard constraint - last chord must be tonic
         # This eliminates entire branches of the search tree early
         # The analysis MUST begin with the last chord being a tonic in the primary tonality.
-        if not primary_tonality.chord_fulfills_function(
-            reversed_chord_sequence[0], TonalFunction.TONIC
-        ):
+        # The memoized function mask answers it without the enharmonic scan on repeat chords.
+        # Checked before anything is built for the search, so rejected inputs cost no more.
+        # When the most likely candidate cannot close the progression, the best ranked one
+        # that can becomes the primary tonality instead.
+        final_chord = input_chord_sequence[-1]
+        tonic_bit = 1 << TonalFunction.TONIC.value
+        closing_tonality = next(
+            (t for t in tonalities_to_test if t.function_mask(final_chord) & tonic_bit), None
+        )
+        if closing_tonality is None:
             failure_explanation.add_step(
                 formal_rule_applied=T("analysis.rules.overall_failure"),
                 observation=T(
                     "analysis.messages.final_chord_not_tonic",
-                    chord_name=reversed_chord_sequence[0].name,
+                    chord_name=final_chord.name,
                     tonality_name=primary_tonality.tonality_name,
                 ),
             )
             return False, failure_explanation
+        primary_tonality = closing_tonality
+
+        # PRUNING STRATEGY 2: Reverse analysis (work backwards from cadential goal)
+        # This significantly reduces the search space by starting from the resolution
+        reversed_chord_sequence = list(reversed(input_chord_sequence))
+
+        # Create the evaluator ONCE with the fixed primary (original) tonality.
+        # The evaluator uses multiple pruning techniques:
+        # - Memoization (Dynamic Programming) to avoid recomputing subproblems
+        # - Depth limiting to prevent infinite recursion
+        # - Priority ordering (direct continuation > pivot > re-anchoring)
+        evaluator = SatisfactionEvaluator(
+            self.kripke_config,
+            self.all_available_tonalities,
+            primary_tonality,
+            chord_tables=self._chord_tables,
+        )
 
         # We initiate the analysis only once from the primary tonality.
         # The evaluator's internal logic (pivots, re-anchoring) is responsible for exploring other tonalities.
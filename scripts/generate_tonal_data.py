@@ -2,17 +2,7 @@
 Tonality Data Generator for Tonalogy API
 
 This module generates comprehensive tonal data for all 24 major and minor tonalities,
-i    DEGREE_INFO: Dict[str, MinorDegreeInfo] = {
-        "i": {"quality": "m", "function": "TONIC", "source": "natural", "index": 0},
-        "iidim": {"quality": "dim", "function": "SUBDOMINANT", "source": "natural", "index": 1},
-        "bIII": {"quality": "", "function": "TONIC", "source": "natural", "index": 2},
-        "iv": {"quality": "m", "function": "SUBDOMINANT", "source": "natural", "index": 3},
-        "v": {"quality": "m", "function": "DOMINANT", "source": "natural", "index": 4},
-        "V": {"quality": "", "function": "DOMINANT", "source": "harmonic", "index": 4},
-        "bVI": {"quality": "", "function": "SUBDOMINANT", "source": "natural", "index": 5},
-        "viidim": {"quality": "dim", "function": "DOMINANT", "source": "harmonic", "index": 6},
-        "bVII": {"quality": "", "function": "SUBDOMINANT", "source": "natural", "index": 6},
-    }eir harmonic fields and chord-function mappings. The generated data is
+including their harmonic fields and chord-function mappings. The generated data is
 used by the Tonalogy API for music theory analysis and chord progression suggestions.
 
 Classes:
@@ -26,6 +16,7 @@ Usage:
     $ python scripts/generate_tonal_data.py
     
     This will generate a tonalities.json file containing all tonality data.
+    Pass --demo to also log an example tonality.
 
 Example:
     from scripts.generate_tonal_data import MajorTonality, MinorTonality
@@ -39,14 +30,24 @@ Example:
     print(a_minor.to_dict())
 """
 
+import argparse
 import json
 import logging
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
 from typing import Any, Dict, List, TypedDict
 
-from core.domain.models import NOTE_NAMES
+from core.domain.models import NOTE_MAP, NOTE_NAMES
 from core.i18n import T
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class DegreeInfo(TypedDict):
     quality: str
@@ -66,9 +67,11 @@ class TonalityGenerator:
     """
 
     NOTE_NAMES = NOTE_NAMES
+    # Note name -> position in NOTE_NAMES
+    NOTE_INDEX = NOTE_MAP
 
     def __init__(self, root_note: str):
-        if root_note not in self.NOTE_NAMES:
+        if root_note not in self.NOTE_INDEX:
             raise ValueError(T("errors.invalid_tonality", root_note=root_note))
         self.root_note = root_note
         self.tonality_name: str = ""
@@ -78,13 +81,9 @@ class TonalityGenerator:
 
     def _build_scale(self, steps: List[int]) -> List[str]:
         """Builds a scale based on the provided steps."""
-        start_index = self.NOTE_NAMES.index(self.root_note)
-        scale = [self.NOTE_NAMES[start_index]]
-        current_index = start_index
-        for step in steps[:-1]:
-            current_index = (current_index + step) % len(self.NOTE_NAMES)
-            scale.append(self.NOTE_NAMES[current_index])
-        return scale
+        start_index = self.NOTE_INDEX[self.root_note]
+        offsets = accumulate(steps[:-1], initial=start_index)
+        return [self.NOTE_NAMES[offset % len(self.NOTE_NAMES)] for offset in offsets]
 
     def to_dict(self) -> Dict[str, Any]:
         """Converts the tonality data to a JSON-serializable dictionary."""
@@ -100,8 +99,6 @@ class MajorTonality(TonalityGenerator):
 
     MAJOR_SCALE_STEPS = [2, 2, 1, 2, 2, 2, 1]
 
-    DEGREE_LABELS = ["I", "ii", "iii", "IV", "V", "vi", "viidim"]
-
     DEGREE_INFO: Dict[str, DegreeInfo] = {
         "I": {"quality": "", "function": "TONIC"},
         "ii": {"quality": "m", "function": "SUBDOMINANT"},
@@ -122,9 +119,8 @@ class MajorTonality(TonalityGenerator):
         """Builds the harmonic field, mapping chords to their 'natural' origin."""
         field: Dict[str, Dict[str, str]] = {"TONIC": {}, "SUBDOMINANT": {}, "DOMINANT": {}}
 
-        for i, degree_label in enumerate(self.DEGREE_LABELS):
-            note = self.scales["natural"][i]
-            info = self.DEGREE_INFO[degree_label]
+        # DEGREE_INFO is ordered by scale degree
+        for note, info in zip(self.scales["natural"], self.DEGREE_INFO.values()):
             quality = info["quality"]
             function_name = info["function"]
 
@@ -161,7 +157,7 @@ class MinorTonality(TonalityGenerator):
         self.scales["natural"] = self._build_scale(self.NATURAL_MINOR_STEPS)
 
         harmonic_scale = self.scales["natural"][:]
-        h_7th_idx = (self.NOTE_NAMES.index(harmonic_scale[6]) + 1) % len(self.NOTE_NAMES)
+        h_7th_idx = (self.NOTE_INDEX[harmonic_scale[6]] + 1) % len(self.NOTE_NAMES)
         harmonic_scale[6] = self.NOTE_NAMES[h_7th_idx]
         self.scales["harmonic"] = harmonic_scale
 
@@ -171,7 +167,7 @@ class MinorTonality(TonalityGenerator):
         """Builds the harmonic field, mapping chords to their specific scale origin."""
         field: Dict[str, Dict[str, str]] = {"TONIC": {}, "SUBDOMINANT": {}, "DOMINANT": {}}
 
-        for _, info in self.DEGREE_INFO.items():
+        for info in self.DEGREE_INFO.values():
             source_scale_name: str = info["source"]
             source_scale = self.scales[source_scale_name]
             note: str = source_scale[info["index"]]
@@ -185,6 +181,18 @@ class MinorTonality(TonalityGenerator):
         return field
 
 
+# There are only 12 roots per mode and construction is pure, so each tonality is built once per
+# process however many times the data is generated.
+@lru_cache(maxsize=None)
+def _make_major(root_note: str) -> MajorTonality:
+    return MajorTonality(root_note)
+
+
+@lru_cache(maxsize=None)
+def _make_minor(root_note: str) -> MinorTonality:
+    return MinorTonality(root_note)
+
+
 def generate_tonal_data_json(filepath: str) -> None:
     """Generates the tonalities.json file with all 24 major and minor tonalities."""
     output_path_obj = Path(filepath)
@@ -195,26 +203,37 @@ def generate_tonal_data_json(filepath: str) -> None:
 
     for note in root_notes:
         try:
-            major_tonality = MajorTonality(note)
+            major_tonality = _make_major(note)
             all_tonalities.append(major_tonality.to_dict())
 
-            minor_tonality = MinorTonality(note)
+            minor_tonality = _make_minor(note)
             all_tonalities.append(minor_tonality.to_dict())
         except ValueError as e:
             logging.error(f"Error generating tonality for {note}: {e}")
 
-    with output_path_obj.open("w", encoding="utf-8") as f:
-        json.dump(all_tonalities, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        # Same layout as the json.dump() fallback: two-space indent, UTF-8 without escapes
+        output_path_obj.write_bytes(orjson.dumps(all_tonalities, option=orjson.OPT_INDENT_2))
+    else:
+        with output_path_obj.open("w", encoding="utf-8") as f:
+            json.dump(all_tonalities, f, indent=2, ensure_ascii=False)
 
     logging.info(f"File '{filepath}' generated successfully with {len(all_tonalities)} tonalities.")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generates core/config/data/tonalities.json.")
+    parser.add_argument(
+        "--demo", action="store_true", help="also log the generated data for D minor"
+    )
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     # Assumes the script is run from the project root
     output_path = "core/config/data/tonalities.json"
     generate_tonal_data_json(output_path)
 
-    logging.info(f"\nExample for D minor (with chords from all scales):")
-    d_minor = MinorTonality("D")
-    logging.info(json.dumps(d_minor.to_dict(), indent=2))
+    if args.demo:
+        logging.info(f"\nExample for D minor (with chords from all scales):")
+        d_minor = _make_minor("D")
+        logging.info(json.dumps(d_minor.to_dict(), indent=2))
@@ -0,0 +1,57 @@
+from typing import Any, AsyncGenerator, Callable, Dict, Generator, Optional
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+# The application is imported inside the fixtures: importing it builds the knowledge base and
+# pulls in the visualizer, which the service tests in this package do not need.
+
+
+@pytest.fixture(scope="session")
+def client() -> Generator[TestClient, None, None]:
+    """A test client that can make calls to our API, shared by every API test."""
+    from api.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture
+async def async_client() -> AsyncGenerator[AsyncClient, None]:
+    """
+    An async client that calls the application in the test's own event loop, without the
+    thread hop of TestClient. It does not run the application's lifespan.
+    """
+    from api.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+DependencyOverride = Callable[[Callable[..., Any], Callable[..., Any]], None]
+
+
+@pytest.fixture
+def override_dependency() -> Generator[DependencyOverride, None, None]:
+    """
+    Installs dependency overrides for one test: override_dependency(dependency, provider).
+    Only the dependencies overridden this way are touched, and each gets back the override it
+    had before, such as the real services wired up by api.main, after the test.
+    """
+    from api.main import app
+
+    previous: Dict[Callable[..., Any], Optional[Callable[..., Any]]] = {}
+
+    def override(dependency: Callable[..., Any], provider: Callable[..., Any]) -> None:
+        previous.setdefault(dependency, app.dependency_overrides.get(dependency))
+        app.dependency_overrides[dependency] = provider
+
+    yield override
+
+    for dependency, provider in previous.items():
+        if provider is None:
+            app.dependency_overrides.pop(dependency, None)
+        else:
+            app.dependency_overrides[dependency] = provider
@@ -1,52 +1,65 @@
-from typing import Any, Dict, Generator
+from typing import Any, Callable, Dict
 from unittest.mock import MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 
+# The dependency we'll replace
 from api.endpoints.analysis import get_analysis_service
-
-# Import our FastAPI application and the dependencies we'll replace
-from api.main import app
 from api.schemas.analysis_schemas import ProgressionAnalysisResponse
 from api.services.analysis_service import TonalAnalysisService
 
 # --- Test Setup ---
 
-# Create a test client that can make calls to our API
-client = TestClient(app)
+# Predictable service responses. They are never modified, so each is validated by our Pydantic
+# schema once, when the module is imported.
+SUCCESS_RESPONSE_DATA: Dict[str, Any] = {
+    "is_tonal_progression": True,
+    "identified_tonality": "C Major",
+    "explanation_details": [
+        {
+            "formal_rule_applied": "Overall Success",
+            "observation": "Progression identified as tonal.",
+            "tonality_used_in_step": "C Major",
+            "processed_chord": "C",
+            "evaluated_functional_state": "TONIC (s_t)",
+        }
+    ],
+    "error": None,
+}
+SUCCESS_RESPONSE = ProgressionAnalysisResponse(**SUCCESS_RESPONSE_DATA)
+
+UNKNOWN_TONALITY_RESPONSE_DATA: Dict[str, Any] = {
+    "is_tonal_progression": False,
+    "identified_tonality": None,
+    "explanation_details": [],
+    "error": "Tonality 'D Major' is not known.",
+}
+UNKNOWN_TONALITY_RESPONSE = ProgressionAnalysisResponse(**UNKNOWN_TONALITY_RESPONSE_DATA)
+
+
+@pytest.fixture
+def mock_service(override_dependency: Callable[..., None]) -> MagicMock:
+    """
+    A mock of the analysis service, installed in place of the real dependency using FastAPI's
+    mechanism. The override the application had before is restored after the test, ensuring
+    test isolation.
+    """
+    service = MagicMock(spec=TonalAnalysisService)
+    override_dependency(get_analysis_service, lambda: service)
+    return service
+
 
 # --- Endpoint Tests ---
 
 
-def test_analyze_endpoint_success() -> None:
+def test_analyze_endpoint_success(client: TestClient, mock_service: MagicMock) -> None:
     """
     Tests a successful call to the /analyze endpoint.
     """
     # GIVEN
-    # Create a mock of the analysis service that returns a predictable success response
-    mock_service = MagicMock(spec=TonalAnalysisService)
-    mock_response_data: Dict[str, Any] = {
-        "is_tonal_progression": True,
-        "identified_tonality": "C Major",
-        "explanation_details": [
-            {
-                "formal_rule_applied": "Overall Success",
-                "observation": "Progression identified as tonal.",
-                "tonality_used_in_step": "C Major",
-                "processed_chord": "C",
-                "evaluated_functional_state": "TONIC (s_t)",
-            }
-        ],
-        "error": None,
-    }
-    # Use our Pydantic schema to create the response object
-    mock_service.analyze_progression.return_value = ProgressionAnalysisResponse(
-        **mock_response_data
-    )
-
-    # Replace the real dependency with our mock using FastAPI's mechanism
-    app.dependency_overrides[get_analysis_service] = lambda: mock_service
+    # The mocked analysis service returns a predictable success response
+    mock_service.analyze_progression.return_value = SUCCESS_RESPONSE
 
     # The request body we'll send
     request_payload: Dict[str, Any] = {"chords": ["C", "G", "C"]}
@@ -62,23 +75,15 @@ def test_analyze_endpoint_success() -> None:
     assert "explanation_details" in response_data
 
 
-def test_analyze_endpoint_bad_request_known_error() -> None:
+def test_analyze_endpoint_bad_request_known_error(
+    client: TestClient, mock_service: MagicMock
+) -> None:
     """
     Tests if the endpoint returns a 400 error when the service detects a known problem.
     """
     # GIVEN
     # Simulate the service returning a known error (e.g., tonality not found)
-    mock_service = MagicMock(spec=TonalAnalysisService)
-    mock_response_data: Dict[str, Any] = {
-        "is_tonal_progression": False,
-        "identified_tonality": None,
-        "explanation_details": [],
-        "error": "Tonality 'D Major' is not known.",
-    }
-    mock_service.analyze_progression.return_value = ProgressionAnalysisResponse(
-        **mock_response_data
-    )
-    app.dependency_overrides[get_analysis_service] = lambda: mock_service
+    mock_service.analyze_progression.return_value = UNKNOWN_TONALITY_RESPONSE
 
     request_payload: Dict[str, Any] = {"chords": ["C"], "tonalities_to_test": ["D Major"]}
 
@@ -90,16 +95,13 @@ def test_analyze_endpoint_bad_request_known_error() -> None:
     assert response.json()["detail"] == "Tonality 'D Major' is not known."
 
 
-def test_analyze_endpoint_invalid_payload() -> None:
+def test_analyze_endpoint_invalid_payload(client: TestClient, mock_service: MagicMock) -> None:
     """
     Tests if FastAPI returns a 422 error (Unprocessable Entity) for an invalid payload,
     such as an empty chord list.
     """
     # GIVEN: a payload that violates Pydantic rules (chords cannot be empty)
-    # Set up a mock service so the dependency is properly overridden
-    mock_service = MagicMock(spec=TonalAnalysisService)
-    app.dependency_overrides[get_analysis_service] = lambda: mock_service
-
+    # The mock service fixture makes sure the dependency is properly overridden
     request_payload: Dict[str, Any] = {"chords": []}  # min_items=1 is violated
 
     # WHEN
@@ -109,15 +111,15 @@ def test_analyze_endpoint_invalid_payload() -> None:
     assert response.status_code == 422  # FastAPI handles this automatically
 
 
-def test_analyze_endpoint_internal_server_error() -> None:
+def test_analyze_endpoint_internal_server_error(
+    client: TestClient, mock_service: MagicMock
+) -> None:
     """
     Tests if the endpoint returns a 500 error for an unexpected exception in the service.
     """
     # GIVEN
     # Simulate an unexpected exception being raised by the service
-    mock_service = MagicMock(spec=TonalAnalysisService)
     mock_service.analyze_progression.side_effect = ValueError("Something unexpected happened!")
-    app.dependency_overrides[get_analysis_service] = lambda: mock_service
 
     request_payload: Dict[str, Any] = {"chords": ["C"]}
 
@@ -129,7 +131,7 @@ def test_analyze_endpoint_internal_server_error() -> None:
     assert "internal server error" in response.json()["detail"]
 
 
-def test_root_endpoint() -> None:
+def test_root_endpoint(client: TestClient) -> None:
     """
     Test the root endpoint to ensure the API is responding correctly.
     """
@@ -143,16 +145,3 @@ def test_root_endpoint() -> None:
     assert response.json() == {
         "message": "Welcome to Tonalogy API. Visit /docs to see the API documentation."
     }
-
-
-# --- Dependency Cleanup ---
-
-
-@pytest.fixture(autouse=True)
-def cleanup_dependencies() -> Generator[None, None, None]:
-    """
-    A fixture that ensures dependency overrides are cleaned up
-    after each test execution, ensuring test isolation.
-    """
-    yield
-    app.dependency_overrides = {}
@@ -1,37 +1,88 @@
 import os
-from typing import Any, Dict
-from unittest.mock import MagicMock, patch
+from typing import Any, Callable, Dict, Optional
+from unittest.mock import MagicMock
 
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
 from api.endpoints.analysis import get_analysis_service
 from api.endpoints.visualizer import get_visualizer_service
-from api.main import app
 from api.schemas.analysis_schemas import ExplanationStepAPI, ProgressionAnalysisResponse
 from api.services.analysis_service import TonalAnalysisService
 from api.services.visualizer_service import VisualizerService
 
-# Create a test client that can make calls to our API
-client = TestClient(app)
+# The bytes the mocked visualizer service hands back as the rendered image.
+FAKE_PNG = b"\x89PNG\r\n\x1a\nfake image data"
+
+# Analysis results the failure scenarios start from.
+TONAL_RESPONSE = ProgressionAnalysisResponse(
+    is_tonal_progression=True,
+    identified_tonality="C Major",
+    explanation_details=[],
+    error=None,
+)
+NON_TONAL_RESPONSE = ProgressionAnalysisResponse(
+    is_tonal_progression=False,
+    identified_tonality=None,
+    explanation_details=[],
+    error="Progression is not tonal",
+)
+
+# MagicMock(spec=...) walks the spec class on creation, so each service mock is built once per
+# module and reset before every test that uses it.
+
+
+@pytest.fixture(scope="module")
+def analysis_service_mock() -> MagicMock:
+    """A mock of the analysis service, shared by the tests of this module."""
+    return MagicMock(spec=TonalAnalysisService)
+
+
+@pytest.fixture(scope="module")
+def visualizer_service_mock() -> MagicMock:
+    """A mock of the visualizer service, shared by the tests of this module."""
+    return MagicMock(spec=VisualizerService)
+
+
+@pytest.fixture
+def mock_analysis_service(
+    analysis_service_mock: MagicMock, override_dependency: Callable[..., None]
+) -> MagicMock:
+    """
+    The module's analysis service mock, with no calls, return values or side effects, installed
+    in place of the real dependency.
+    """
+    analysis_service_mock.reset_mock(return_value=True, side_effect=True)
+    override_dependency(get_analysis_service, lambda: analysis_service_mock)
+    return analysis_service_mock
+
+
+@pytest.fixture
+def mock_visualizer_service(
+    visualizer_service_mock: MagicMock, override_dependency: Callable[..., None]
+) -> MagicMock:
+    """
+    The module's visualizer service mock, with no calls, return values or side effects,
+    installed in place of the real dependency.
+    """
+    visualizer_service_mock.reset_mock(return_value=True, side_effect=True)
+    override_dependency(get_visualizer_service, lambda: visualizer_service_mock)
+    return visualizer_service_mock
 
 
 class TestVisualizerEndpoint:
     """Test cases for the /visualize endpoint."""
 
-    def setup_method(self) -> None:
-        """Clear dependency overrides before each test."""
-        app.dependency_overrides.clear()
-
-    def teardown_method(self) -> None:
-        """Clear dependency overrides after each test."""
-        app.dependency_overrides.clear()
-
-    def test_visualize_endpoint_success(self) -> None:
+    @pytest.mark.asyncio
+    async def test_visualize_endpoint_success(
+        self,
+        async_client: AsyncClient,
+        mock_analysis_service: MagicMock,
+        mock_visualizer_service: MagicMock,
+    ) -> None:
         """Test successful visualization of a tonal progression."""
         # GIVEN
         # Mock the analysis service to return a successful tonal analysis
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
         mock_analysis_response = ProgressionAnalysisResponse(
             is_tonal_progression=True,
             identified_tonality="C Major",
@@ -48,162 +99,123 @@ class TestVisualizerEndpoint:
         )
         mock_analysis_service.analyze_progression.return_value = mock_analysis_response
 
-        # Mock the visualizer service to return a fake image path
-        mock_visualizer_service = MagicMock(spec=VisualizerService)
-        fake_image_path = "/fake/path/to/image.png"
-        mock_visualizer_service.create_graph_from_analysis.return_value = fake_image_path
-
-        # Mock os.path.exists to return True for our fake path
-        with patch("os.path.exists", return_value=True):
-            # Replace the real dependencies with our mocks
-            app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-            app.dependency_overrides[get_visualizer_service] = lambda: mock_visualizer_service
+        # Mock the visualizer service to return a fake rendered image
+        mock_visualizer_service.create_graph_from_analysis.return_value = FAKE_PNG
 
-            # WHEN
-            request_payload = {"chords": ["C", "G", "F"]}
-            response = client.post("/visualize", json=request_payload)
+        # WHEN
+        request_payload = {"chords": ["C", "G", "F"]}
+        response = await async_client.post("/visualize", json=request_payload)
 
         # THEN
         assert response.status_code == 200
         assert response.headers["content-type"] == "image/png"
+        assert response.content == FAKE_PNG
         mock_analysis_service.analyze_progression.assert_called_once()
         mock_visualizer_service.create_graph_from_analysis.assert_called_once_with(
-            mock_analysis_response
-        )
-
-    def test_visualize_endpoint_non_tonal_progression(self) -> None:
-        """Test visualization fails with 400 when progression is not tonal."""
-        # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
-        mock_analysis_response = ProgressionAnalysisResponse(
-            is_tonal_progression=False,
-            identified_tonality=None,
-            explanation_details=[],
-            error="Progression is not tonal",
-        )
-        mock_analysis_service.analyze_progression.return_value = mock_analysis_response
-
-        app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-
-        # WHEN
-        request_payload = {"chords": ["Random", "Non", "Tonal"]}
-        response = client.post("/visualize", json=request_payload)
-
-        # THEN
-        assert response.status_code == 400
-        assert "not tonal" in response.json()["detail"]
-
-    def test_visualize_endpoint_image_file_not_found(self) -> None:
-        """Test visualization fails with 500 when generated image file is not found."""
-        # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
-        mock_analysis_response = ProgressionAnalysisResponse(
-            is_tonal_progression=True,
-            identified_tonality="C Major",
-            explanation_details=[],
-            error=None,
+            mock_analysis_response, theme_mode="light"
         )
-        mock_analysis_service.analyze_progression.return_value = mock_analysis_response
-
-        mock_visualizer_service = MagicMock(spec=VisualizerService)
-        fake_image_path = "/non/existent/path/image.png"
-        mock_visualizer_service.create_graph_from_analysis.return_value = fake_image_path
-
-        # Mock os.path.exists to return False for our fake path
-        with patch("os.path.exists", return_value=False):
-            app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-            app.dependency_overrides[get_visualizer_service] = lambda: mock_visualizer_service
 
-            # WHEN
-            request_payload = {"chords": ["C", "G", "F"]}
-            response = client.post("/visualize", json=request_payload)
-
-        # THEN
-        assert response.status_code == 500
-        assert "Image file not found" in response.json()["detail"]
-
-    def test_visualize_endpoint_visualizer_value_error(self) -> None:
-        """Test visualization fails with 400 when VisualizerService raises ValueError."""
+    @pytest.mark.parametrize(
+        "analysis_response, graph_outcome, expected_status, expected_detail",
+        [
+            pytest.param(
+                NON_TONAL_RESPONSE,
+                None,
+                400,
+                "not tonal",
+                id="non_tonal_progression",
+            ),
+            pytest.param(
+                ProgressionAnalysisResponse(
+                    is_tonal_progression=False,
+                    identified_tonality=None,
+                    explanation_details=[],
+                    error="Specific analysis failure reason",
+                ),
+                None,
+                400,
+                "Specific analysis failure reason",
+                id="error_message_propagation",
+            ),
+            pytest.param(
+                TONAL_RESPONSE,
+                ValueError("Cannot visualize invalid progression"),
+                400,
+                "Cannot visualize invalid progression",
+                id="visualizer_value_error",
+            ),
+            pytest.param(
+                TONAL_RESPONSE,
+                Exception("Unexpected error"),
+                500,
+                "internal error occurred during visualization",
+                id="internal_server_error",
+            ),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_visualize_endpoint_failure(
+        self,
+        async_client: AsyncClient,
+        mock_analysis_service: MagicMock,
+        mock_visualizer_service: MagicMock,
+        analysis_response: ProgressionAnalysisResponse,
+        graph_outcome: Optional[Exception],
+        expected_status: int,
+        expected_detail: str,
+    ) -> None:
+        """
+        Test that every way the visualization can fail is reported with the right status code
+        and a detail that explains it: non-tonal progressions (with the analysis error passed
+        on) and errors raised by the VisualizerService.
+        """
         # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
-        mock_analysis_response = ProgressionAnalysisResponse(
-            is_tonal_progression=True,
-            identified_tonality="C Major",
-            explanation_details=[],
-            error=None,
-        )
-        mock_analysis_service.analyze_progression.return_value = mock_analysis_response
-
-        mock_visualizer_service = MagicMock(spec=VisualizerService)
-        mock_visualizer_service.create_graph_from_analysis.side_effect = ValueError(
-            "Cannot visualize invalid progression"
-        )
-
-        app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-        app.dependency_overrides[get_visualizer_service] = lambda: mock_visualizer_service
+        mock_analysis_service.analyze_progression.return_value = analysis_response
+        if graph_outcome is not None:
+            mock_visualizer_service.create_graph_from_analysis.side_effect = graph_outcome
 
         # WHEN
         request_payload = {"chords": ["C", "G", "F"]}
-        response = client.post("/visualize", json=request_payload)
+        response = await async_client.post("/visualize", json=request_payload)
 
         # THEN
-        assert response.status_code == 400
-        assert "Cannot visualize invalid progression" in response.json()["detail"]
-
-    def test_visualize_endpoint_internal_server_error(self) -> None:
-        """Test visualization fails with 500 when an unexpected error occurs."""
-        # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
-        mock_analysis_response = ProgressionAnalysisResponse(
-            is_tonal_progression=True,
-            identified_tonality="C Major",
-            explanation_details=[],
-            error=None,
-        )
-        mock_analysis_service.analyze_progression.return_value = mock_analysis_response
-
-        mock_visualizer_service = MagicMock(spec=VisualizerService)
-        mock_visualizer_service.create_graph_from_analysis.side_effect = Exception(
-            "Unexpected error"
-        )
-
-        app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-        app.dependency_overrides[get_visualizer_service] = lambda: mock_visualizer_service
-
+        assert response.status_code == expected_status
+        assert expected_detail in response.json()["detail"]
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            pytest.param({}, id="missing_chords"),
+            pytest.param({"invalid_field": "value"}, id="wrong_field_name"),
+            pytest.param({"chords": "not_a_list"}, id="wrong_chords_type"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_visualize_endpoint_invalid_request_format(
+        self,
+        async_client: AsyncClient,
+        mock_analysis_service: MagicMock,
+        mock_visualizer_service: MagicMock,
+        payload: Dict[str, Any],
+    ) -> None:
+        """Test visualization fails with 422 when request format is invalid."""
         # WHEN
-        request_payload = {"chords": ["C", "G", "F"]}
-        response = client.post("/visualize", json=request_payload)
+        response = await async_client.post("/visualize", json=payload)
 
         # THEN
-        assert response.status_code == 500
-        assert "internal error occurred during visualization" in response.json()["detail"]
-
-    def test_visualize_endpoint_invalid_request_format(self) -> None:
-        """Test visualization fails with 422 when request format is invalid."""
-        # This test is simplified to avoid dependency injection issues
-        # Since we're testing the endpoint behavior with invalid input,
-        # we don't need the full dependency setup
-
-        # Just verify that invalid JSON structure would fail validation
-        # In a real scenario, this would return 422 Unprocessable Entity
-        invalid_payloads = [
-            {},  # Missing required fields
-            {"invalid_field": "value"},  # Wrong field names
-            {"chords": "not_a_list"},  # Wrong data type
-        ]
-
-        for payload in invalid_payloads:
-            # For now, we'll just check that these payloads are indeed invalid
-            # In a full integration test, these would be sent to the endpoint
-            assert isinstance(payload, dict)  # Just check it's a dict
-
-        # Placeholder assertion for the test structure
-        assert True
-
-    def test_visualize_endpoint_with_specific_tonalities(self) -> None:
+        assert response.status_code == 422
+        mock_analysis_service.analyze_progression.assert_not_called()
+        mock_visualizer_service.create_graph_from_analysis.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_visualize_endpoint_with_specific_tonalities(
+        self,
+        async_client: AsyncClient,
+        mock_analysis_service: MagicMock,
+        mock_visualizer_service: MagicMock,
+    ) -> None:
         """Test visualization with specific tonalities to test parameter."""
         # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
         mock_analysis_response = ProgressionAnalysisResponse(
             is_tonal_progression=True,
             identified_tonality="G Major",
@@ -212,20 +224,14 @@ class TestVisualizerEndpoint:
         )
         mock_analysis_service.analyze_progression.return_value = mock_analysis_response
 
-        mock_visualizer_service = MagicMock(spec=VisualizerService)
-        fake_image_path = "/fake/path/to/image.png"
-        mock_visualizer_service.create_graph_from_analysis.return_value = fake_image_path
+        mock_visualizer_service.create_graph_from_analysis.return_value = FAKE_PNG
 
-        with patch("os.path.exists", return_value=True):
-            app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-            app.dependency_overrides[get_visualizer_service] = lambda: mock_visualizer_service
-
-            # WHEN
-            request_payload = {
-                "chords": ["G", "D", "C"],
-                "tonalities_to_test": ["G Major", "C Major"],
-            }
-            response = client.post("/visualize", json=request_payload)
+        # WHEN
+        request_payload = {
+            "chords": ["G", "D", "C"],
+            "tonalities_to_test": ["G Major", "C Major"],
+        }
+        response = await async_client.post("/visualize", json=request_payload)
 
         # THEN
         assert response.status_code == 200
@@ -234,33 +240,15 @@ class TestVisualizerEndpoint:
         assert call_args.chords == ["G", "D", "C"]
         assert call_args.tonalities_to_test == ["G Major", "C Major"]
 
-    def test_visualize_endpoint_error_message_propagation(self) -> None:
-        """Test that error messages from non-tonal progressions are properly propagated."""
-        # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
-        specific_error_message = "Specific analysis failure reason"
-        mock_analysis_response = ProgressionAnalysisResponse(
-            is_tonal_progression=False,
-            identified_tonality=None,
-            explanation_details=[],
-            error=specific_error_message,
-        )
-        mock_analysis_service.analyze_progression.return_value = mock_analysis_response
-
-        app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-
-        # WHEN
-        request_payload = {"chords": ["X", "Y", "Z"]}
-        response = client.post("/visualize", json=request_payload)
-
-        # THEN
-        assert response.status_code == 400
-        assert specific_error_message in response.json()["detail"]
-
-    def test_visualize_endpoint_dependencies_called_correctly(self) -> None:
+    @pytest.mark.asyncio
+    async def test_visualize_endpoint_dependencies_called_correctly(
+        self,
+        async_client: AsyncClient,
+        mock_analysis_service: MagicMock,
+        mock_visualizer_service: MagicMock,
+    ) -> None:
         """Test that the endpoint calls the correct service methods with proper arguments."""
         # GIVEN
-        mock_analysis_service = MagicMock(spec=TonalAnalysisService)
         mock_analysis_response = ProgressionAnalysisResponse(
             is_tonal_progression=True,
             identified_tonality="C Major",
@@ -269,17 +257,11 @@ class TestVisualizerEndpoint:
         )
         mock_analysis_service.analyze_progression.return_value = mock_analysis_response
 
-        mock_visualizer_service = MagicMock(spec=VisualizerService)
-        fake_image_path = "/fake/path/to/image.png"
-        mock_visualizer_service.create_graph_from_analysis.return_value = fake_image_path
+        mock_visualizer_service.create_graph_from_analysis.return_value = FAKE_PNG
 
-        with patch("os.path.exists", return_value=True):
-            app.dependency_overrides[get_analysis_service] = lambda: mock_analysis_service
-            app.dependency_overrides[get_visualizer_service] = lambda: mock_visualizer_service
-
-            # WHEN
-            request_payload = {"chords": ["C", "Am", "F", "G"]}
-            response = client.post("/visualize", json=request_payload)
+        # WHEN
+        request_payload = {"chords": ["C", "Am", "F", "G"]}
+        response = await async_client.post("/visualize", json=request_payload)
 
         # THEN
         assert response.status_code == 200
@@ -10,21 +10,27 @@ from api.services.analysis_service import TonalAnalysisService
 from core.domain.models import Chord, DetailedExplanationStep, Explanation, Tonality
 
 
-@pytest.fixture
-def mock_knowledge_base() -> MagicMock:
+@pytest.fixture(scope="module")
+def known_tonalities() -> List[MagicMock]:
     """
-    Creates a mock for TonalKnowledgeBase, simulating access to configuration
-    and a list of known tonalities.
+    Simulates some known tonalities. MagicMock(spec=...) walks the spec class on creation, so
+    they are built once per module; the tests only read them.
     """
-    kb = MagicMock()
-
-    # Simulate some known tonalities
     c_major = MagicMock(spec=Tonality)
     c_major.tonality_name = "C Major"
     g_major = MagicMock(spec=Tonality)
     g_major.tonality_name = "G Major"
+    return [c_major, g_major]
+
 
-    kb.all_tonalities = [c_major, g_major]
+@pytest.fixture
+def mock_knowledge_base(known_tonalities: List[MagicMock]) -> MagicMock:
+    """
+    Creates a mock for TonalKnowledgeBase, simulating access to configuration
+    and a list of known tonalities.
+    """
+    kb = MagicMock()
+    kb.all_tonalities = list(known_tonalities)
     kb.kripke_config = MagicMock()
     return kb
 
@@ -146,3 +152,32 @@ def test_analyze_with_unknown_tonality_to_test(mock_knowledge_base: MagicMock) -
     # THEN
     assert response.is_tonal_progression is False
     assert response.error == "None of the specified tonalities are known by the system."
+
+
+def test_analyze_progression_reuses_chords_across_requests(
+    mock_knowledge_base: MagicMock,
+) -> None:
+    """
+    Tests that a chord named again, in the same request or a later one, is the same instance.
+    """
+    # GIVEN
+    mock_analyzer_instance = MagicMock()
+    mock_analyzer_instance.check_tonal_progression.return_value = (False, Explanation())
+
+    with patch(
+        "api.services.analysis_service.ProgressionAnalyzer", return_value=mock_analyzer_instance
+    ):
+        service: TonalAnalysisService = TonalAnalysisService(mock_knowledge_base)
+        request: ProgressionAnalysisRequest = ProgressionAnalysisRequest(
+            chords=["C", "G", "C"], tonalities_to_test=None, theme="light"
+        )
+
+        # WHEN
+        service.analyze_progression(request)
+        service.analyze_progression(request)
+
+        # THEN
+        first_call, second_call = mock_analyzer_instance.check_tonal_progression.call_args_list
+        first_chords, second_chords = first_call[0][0], second_call[0][0]
+        assert first_chords[0] is first_chords[2]
+        assert all(a is b for a, b in zip(first_chords, second_chords))
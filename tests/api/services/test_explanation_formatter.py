@@ -9,14 +9,19 @@ from api.services.explanation_formatter import ExplanationFormatter
 from core.i18n.locale_manager import locale_manager
 
 
+@pytest.fixture(autouse=True)
+def english_locale():
+    """Run every test in English for consistent output, restoring the previous locale after."""
+    with locale_manager.locale_context("en"):
+        yield
+
+
 class TestExplanationFormatter:
     """Test cases for the ExplanationFormatter."""
 
     def setup_method(self):
         """Set up test fixtures."""
         self.formatter = ExplanationFormatter()
-        # Set default locale to English for consistent tests
-        locale_manager.set_locale("en")
 
     def test_format_explanation_empty_steps(self):
         """Test formatting with no explanation steps."""
@@ -152,8 +157,6 @@ class TestExplanationFormatter:
 
     def test_portuguese_locale(self):
         """Test that Portuguese locale produces Portuguese text."""
-        locale_manager.set_locale("pt_br")
-
         steps = [
             ExplanationStepAPI(
                 formal_rule_applied="P in L",
@@ -172,7 +175,8 @@ class TestExplanationFormatter:
             error=None,
         )
 
-        result = self.formatter.format_explanation(analysis)
+        with locale_manager.locale_context("pt_br"):
+            result = self.formatter.format_explanation(analysis)
 
         # Check for Portuguese text
         assert "Estamos analisando" in result
@@ -201,8 +205,3 @@ class TestExplanationFormatter:
         functions = ["TONIC", "DOMINANT", "TONIC"]
         result = self.formatter._is_plagal_cadence_pattern(functions)
         assert result is False
-
-    def teardown_method(self):
-        """Clean up after each test."""
-        # Reset locale to English
-        locale_manager.set_locale("en")
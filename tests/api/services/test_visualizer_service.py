@@ -1,7 +1,5 @@
 import os
-import uuid
-from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Generator
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,6 +8,9 @@ from api.schemas.analysis_schemas import ExplanationStepAPI, ProgressionAnalysis
 from api.services.visualizer_service import VisualizerService, _extract_pivot_target_tonality
 from visualizer.harmonic_graph import HarmonicGraph
 
+# The bytes the mocked HarmonicGraph renders.
+FAKE_PNG = b"\x89PNG fake image"
+
 
 class TestVisualizerService:
     """Test cases for VisualizerService class."""
@@ -19,6 +20,16 @@ class TestVisualizerService:
         """Create a VisualizerService instance for testing."""
         return VisualizerService()
 
+    @pytest.fixture
+    def mock_harmonic_graph_class(self) -> Generator[MagicMock, None, None]:
+        """
+        Replaces the HarmonicGraph the service builds with a mock; the graph it returns
+        renders FAKE_PNG.
+        """
+        with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
+            mock_graph_class.return_value.render_png.return_value = FAKE_PNG
+            yield mock_graph_class
+
     @pytest.fixture
     def mock_primary_progression_data(self) -> ProgressionAnalysisResponse:
         """Mock analysis data for a simple primary tonality progression."""
@@ -199,7 +210,6 @@ class TestVisualizerService:
         ):
             visualizer_service.create_graph_from_analysis(analysis_data)
 
-    @patch("api.services.visualizer_service.HarmonicGraph")
     @patch("api.services.visualizer_service.get_theme_for_tonality")
     def test_create_graph_primary_progression_success(
         self,
@@ -212,21 +222,18 @@ class TestVisualizerService:
         # Setup mocks
         mock_theme = {"primary_stroke": "#4dabf7", "primary_fill": "#a5d8ff"}
         mock_get_theme.return_value = mock_theme
-        mock_graph_instance = MagicMock()
-        mock_graph_instance.render.return_value = "/fake/path/image.png"
-        mock_harmonic_graph_class.return_value = mock_graph_instance
+        mock_graph_instance = mock_harmonic_graph_class.return_value
 
         # Execute
         result = visualizer_service.create_graph_from_analysis(mock_primary_progression_data)
 
         # Verify
-        assert result == "/fake/path/image.png"
+        assert result == FAKE_PNG
         mock_get_theme.assert_called_with("C Major", "light")
         mock_harmonic_graph_class.assert_called_once()
         mock_graph_instance.add_primary_chord.assert_called()
-        mock_graph_instance.render.assert_called_once()
+        mock_graph_instance.render_png.assert_called_once()
 
-    @patch("api.services.visualizer_service.HarmonicGraph")
     @patch("api.services.visualizer_service.get_theme_for_tonality")
     def test_create_graph_pivot_progression_detects_secondary_tonality(
         self,
@@ -258,15 +265,13 @@ class TestVisualizerService:
             return {}
 
         mock_get_theme.side_effect = theme_side_effect
-        mock_graph_instance = MagicMock()
-        mock_graph_instance.render.return_value = "/fake/path/image.png"
-        mock_harmonic_graph_class.return_value = mock_graph_instance
+        mock_graph_instance = mock_harmonic_graph_class.return_value
 
         # Execute
         result = visualizer_service.create_graph_from_analysis(mock_pivot_progression_data)
 
         # Verify
-        assert result == "/fake/path/image.png"
+        assert result == FAKE_PNG
         # Check that secondary tonality was detected and used
         assert mock_get_theme.call_count >= 2  # Called for both primary and secondary
         mock_get_theme.assert_any_call("C Major", "light")
@@ -275,7 +280,6 @@ class TestVisualizerService:
         # Verify that secondary chord with theme was called
         assert mock_graph_instance.add_secondary_chord_with_theme.call_count > 0
 
-    @patch("api.services.visualizer_service.HarmonicGraph")
     @patch("api.services.visualizer_service.get_theme_for_tonality")
     def test_create_graph_secondary_progression_uses_correct_theme(
         self,
@@ -307,15 +311,13 @@ class TestVisualizerService:
             return {}
 
         mock_get_theme.side_effect = theme_side_effect
-        mock_graph_instance = MagicMock()
-        mock_graph_instance.render.return_value = "/fake/path/image.png"
-        mock_harmonic_graph_class.return_value = mock_graph_instance
+        mock_graph_instance = mock_harmonic_graph_class.return_value
 
         # Execute
         result = visualizer_service.create_graph_from_analysis(mock_secondary_progression_data)
 
         # Verify
-        assert result == "/fake/path/image.png"
+        assert result == FAKE_PNG
         # Check that secondary theme was used for E minor tonality
         mock_get_theme.assert_any_call("D Major", "light")
         mock_get_theme.assert_any_call("E minor", "light")
@@ -323,31 +325,24 @@ class TestVisualizerService:
         # Verify that secondary chord with specific theme was called
         assert mock_graph_instance.add_secondary_chord_with_theme.call_count > 0
 
-    @patch("api.services.visualizer_service.uuid.uuid4")
-    def test_create_graph_generates_unique_filename(
+    def test_create_graph_renders_in_memory(
         self,
-        mock_uuid: MagicMock,
+        mock_harmonic_graph_class: MagicMock,
         visualizer_service: VisualizerService,
         mock_primary_progression_data: ProgressionAnalysisResponse,
     ) -> None:
-        """Test that each graph generation creates a unique filename."""
-        mock_uuid.return_value = uuid.UUID("12345678-1234-5678-1234-567812345678")
-
-        with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
-            mock_graph_instance = MagicMock()
-            expected_path = str(
-                Path(__file__).resolve().parent.parent.parent
-                / "temp_images"
-                / "12345678-1234-5678-1234-567812345678.png"
-            )
-            mock_graph_instance.render.return_value = expected_path
-            mock_graph_class.return_value = mock_graph_instance
+        """Test that the graph is rendered to PNG bytes instead of an image file on disk."""
+        mock_graph_instance = mock_harmonic_graph_class.return_value
 
-            result = visualizer_service.create_graph_from_analysis(mock_primary_progression_data)
+        result = visualizer_service.create_graph_from_analysis(mock_primary_progression_data)
 
-            assert "12345678-1234-5678-1234-567812345678" in result
+        assert result == FAKE_PNG
+        mock_graph_instance.render_png.assert_called_once_with()
+        mock_graph_instance.render.assert_not_called()
 
-    def test_minor_tonality_uses_dashed_style(self, visualizer_service: VisualizerService) -> None:
+    def test_minor_tonality_uses_dashed_style(
+        self, mock_harmonic_graph_class: MagicMock, visualizer_service: VisualizerService
+    ) -> None:
         """Test that minor tonalities use dashed style variant."""
         analysis_data = ProgressionAnalysisResponse(
             is_tonal_progression=True,
@@ -364,19 +359,18 @@ class TestVisualizerService:
             error=None,
         )
 
-        with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
-            mock_graph_instance = MagicMock()
-            mock_graph_instance.render.return_value = "/fake/path/image.png"
-            mock_graph_class.return_value = mock_graph_instance
+        mock_graph_instance = mock_harmonic_graph_class.return_value
 
-            visualizer_service.create_graph_from_analysis(analysis_data)
+        visualizer_service.create_graph_from_analysis(analysis_data)
 
-            # Verify that primary chord was called with dashed_filled style
-            mock_graph_instance.add_primary_chord.assert_called()
-            call_args = mock_graph_instance.add_primary_chord.call_args
-            assert call_args[1]["style_variant"] == "dashed_filled"
+        # Verify that primary chord was called with dashed_filled style
+        mock_graph_instance.add_primary_chord.assert_called()
+        call_args = mock_graph_instance.add_primary_chord.call_args
+        assert call_args[1]["style_variant"] == "dashed_filled"
 
-    def test_major_tonality_uses_solid_style(self, visualizer_service: VisualizerService) -> None:
+    def test_major_tonality_uses_solid_style(
+        self, mock_harmonic_graph_class: MagicMock, visualizer_service: VisualizerService
+    ) -> None:
         """Test that major tonalities use solid style variant."""
         analysis_data = ProgressionAnalysisResponse(
             is_tonal_progression=True,
@@ -393,14 +387,11 @@ class TestVisualizerService:
             error=None,
         )
 
-        with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
-            mock_graph_instance = MagicMock()
-            mock_graph_instance.render.return_value = "/fake/path/image.png"
-            mock_graph_class.return_value = mock_graph_instance
+        mock_graph_instance = mock_harmonic_graph_class.return_value
 
-            visualizer_service.create_graph_from_analysis(analysis_data)
+        visualizer_service.create_graph_from_analysis(analysis_data)
 
-            # Verify that primary chord was called with solid_filled style
-            mock_graph_instance.add_primary_chord.assert_called()
-            call_args = mock_graph_instance.add_primary_chord.call_args
-            assert call_args[1]["style_variant"] == "solid_filled"
+        # Verify that primary chord was called with solid_filled style
+        mock_graph_instance.add_primary_chord.assert_called()
+        call_args = mock_graph_instance.add_primary_chord.call_args
+        assert call_args[1]["style_variant"] == "solid_filled"
@@ -2,20 +2,12 @@
 End-to-end test for flat notation support through the API.
 """
 
-import pytest
 from fastapi.testclient import TestClient
 
-from api.main import app
-
 
 class TestFlatAPISupport:
     """Test class for flat notation support through the API endpoints."""
 
-    @pytest.fixture
-    def client(self) -> TestClient:
-        """Create a test client for the API."""
-        return TestClient(app)
-
     def test_analyze_progression_with_flats(self, client: TestClient) -> None:
         """Test that the analysis endpoint works with flat notation."""
         # Create a progression using flat notation
@@ -10,10 +10,11 @@ from core.domain.models import Chord, KripkeState, KripkeStructureConfig, TonalF
 # --- Fixtures to create temporary configuration files ---
 
 
-@pytest.fixture
-def temp_kripke_config_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def temp_kripke_config_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
-    Creates a temporary kripke_structure.json file for tests.
+    Creates a temporary kripke_structure.json file for tests. The tests only read it, so it is
+    written once per module.
     """
     kripke_data = {
         "states": [
@@ -25,15 +26,16 @@ def temp_kripke_config_file(tmp_path: Path) -> Path:
         "final_states": ["s_d", "s_sd"],
         "accessibility_relation": [{"from": "s_t", "to": "s_d"}, {"from": "s_d", "to": "s_sd"}],
     }
-    file_path = tmp_path / "kripke_structure.json"
+    file_path = tmp_path_factory.mktemp("config") / "kripke_structure.json"
     file_path.write_text(json.dumps(kripke_data))
     return file_path
 
 
-@pytest.fixture
-def temp_tonalities_config_file(tmp_path: Path) -> Path:
+@pytest.fixture(scope="module")
+def temp_tonalities_config_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
-    Creates a temporary tonalities.json file for tests.
+    Creates a temporary tonalities.json file for tests. The tests only read it, so it is
+    written once per module.
     """
     tonalities_data = [
         {
@@ -53,27 +55,30 @@ def temp_tonalities_config_file(tmp_path: Path) -> Path:
             },
         },
     ]
-    file_path = tmp_path / "tonalities.json"
+    file_path = tmp_path_factory.mktemp("config") / "tonalities.json"
     file_path.write_text(json.dumps(tonalities_data))
     return file_path
 
 
+@pytest.fixture(scope="module")
+def knowledge_base(
+    temp_kripke_config_file: Path, temp_tonalities_config_file: Path
+) -> TonalKnowledgeBase:
+    """
+    A TonalKnowledgeBase loaded from the temporary configuration files, shared by the tests
+    that only inspect what was loaded.
+    """
+    return TonalKnowledgeBase(temp_kripke_config_file, temp_tonalities_config_file)
+
+
 # --- Tests for TonalKnowledgeBase Class ---
 
 
-def test_knowledge_base_loads_successfully(
-    temp_kripke_config_file: Path, temp_tonalities_config_file: Path
-) -> None:
+def test_knowledge_base_loads_successfully(knowledge_base: TonalKnowledgeBase) -> None:
     """
     Tests if TonalKnowledgeBase loads and interprets configuration files correctly.
     """
-    # GIVEN: Paths to valid configuration files
-    kripke_path = temp_kripke_config_file
-    tonalities_path = temp_tonalities_config_file
-
-    # WHEN: TonalKnowledgeBase is instantiated
-    knowledge_base = TonalKnowledgeBase(kripke_path, tonalities_path)
-
+    # GIVEN: A TonalKnowledgeBase instantiated from valid configuration files
     # THEN: Properties should be loaded and have the correct types
     assert isinstance(knowledge_base.kripke_config, KripkeStructureConfig)
     assert isinstance(knowledge_base.all_tonalities, list)
@@ -81,14 +86,11 @@ def test_knowledge_base_loads_successfully(
     assert all(isinstance(t, Tonality) for t in knowledge_base.all_tonalities)
 
 
-def test_kripke_config_parsing(
-    temp_kripke_config_file: Path, temp_tonalities_config_file: Path
-) -> None:
+def test_kripke_config_parsing(knowledge_base: TonalKnowledgeBase) -> None:
     """
     Verifies if Kripke structure data was parsed to the correct domain objects.
     """
     # GIVEN: A loaded TonalKnowledgeBase
-    knowledge_base = TonalKnowledgeBase(temp_kripke_config_file, temp_tonalities_config_file)
     k_config = knowledge_base.kripke_config
 
     # THEN: The internal structure should be correct
@@ -106,14 +108,11 @@ def test_kripke_config_parsing(
     assert expected_relation in k_config.accessibility_relation
 
 
-def test_tonalities_parsing(
-    temp_kripke_config_file: Path, temp_tonalities_config_file: Path
-) -> None:
+def test_tonalities_parsing(knowledge_base: TonalKnowledgeBase) -> None:
     """
     Verifies if tonality data was parsed to the correct domain objects.
     """
     # GIVEN: A loaded TonalKnowledgeBase
-    knowledge_base = TonalKnowledgeBase(temp_kripke_config_file, temp_tonalities_config_file)
     test_major = next(t for t in knowledge_base.all_tonalities if t.tonality_name == "Test Major")
 
     # THEN: The internal structure of the tonality should be correct
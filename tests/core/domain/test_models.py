@@ -1,4 +1,5 @@
 import copy
+import sys
 from enum import Enum, auto
 from typing import Dict
 
@@ -8,6 +9,7 @@ from core.domain.models import (
     Chord,
     DetailedExplanationStep,
     Explanation,
+    KripkePath,
     KripkeState,
     KripkeStructureConfig,
     TonalFunction,
@@ -446,3 +448,182 @@ def test_explanation_clone_with_multiple_steps(
     assert len(exp_orig.steps) == len(original_steps_copy) + 1
     assert exp_orig.steps[-1].observation == "Original Only"
     assert exp_cloned.steps[-1].observation == "Clone Only"
+
+
+def test_explanation_clone_shares_domain_objects(
+    explanation_with_one_step: Explanation,
+) -> None:
+    """Test that cloning copies the steps but not the tonalities they refer to."""
+    exp_orig = explanation_with_one_step
+    exp_cloned = exp_orig.clone()
+
+    assert exp_cloned.steps[0] is not exp_orig.steps[0]
+    assert exp_cloned.steps[0].tonality_used_in_step is exp_orig.steps[0].tonality_used_in_step
+
+    exp_cloned.steps[0].observation = "Clone Only"
+    assert exp_orig.steps[0].observation != "Clone Only"
+
+
+def test_explanation_render_materializes_deferred_observation(
+    empty_explanation: Explanation,
+) -> None:
+    """Test that deferred observations are only produced when the explanation is rendered."""
+    exp = empty_explanation
+    calls = []
+
+    def render_observation() -> str:
+        calls.append(1)
+        return "Rendered observation."
+
+    exp.add_step(
+        formal_rule_applied="Deferred Rule",
+        observation="",
+        deferred_observation=render_observation,
+    )
+    assert calls == [], "Observation should not be rendered when the step is added"
+
+    assert exp.render() is exp
+    assert exp.steps[0].observation == "Rendered observation."
+    assert exp.steps[0].deferred_observation is None
+
+    exp.render()
+    assert len(calls) == 1, "Rendering twice should not re-run the formatter"
+
+
+def test_explanation_branch_and_flatten(sample_detailed_step: DetailedExplanationStep) -> None:
+    """Tests that branches share their parent's steps and flatten() restores the full sequence."""
+    root = Explanation(steps=[sample_detailed_step])
+    first = root.branch()
+    first.add_step(formal_rule_applied="First", observation="first branch")
+    second = root.branch()
+    second.add_step(formal_rule_applied="Second", observation="second branch")
+
+    assert first.steps != second.steps
+    flat = first.flatten()
+    assert flat.parent is None
+    assert [s.formal_rule_applied for s in flat.steps] == [
+        sample_detailed_step.formal_rule_applied,
+        "First",
+    ]
+    assert flat.steps[0] is sample_detailed_step
+    assert len(second.clone().steps) == 2
+    assert len(root.steps) == 1
+
+
+def test_kripke_path_pop_step_undoes_add_step(
+    sample_states: Dict, c_major_tonality: Tonality
+) -> None:
+    """Tests that pop_step() restores the path to its state before the last add_step()."""
+    path = KripkePath()
+    path.add_step(sample_states["s_t"], c_major_tonality, "start")
+    frozen = path.clone()
+    path.add_step(sample_states["s_d"], c_major_tonality, "to dominant")
+    assert path.get_current_state() == sample_states["s_d"]
+
+    path.pop_step()
+    assert path == frozen
+    assert path.get_current_state() == sample_states["s_t"]
+    assert frozen.get_length() == 1
+
+
+def test_kripke_path_render_materializes_deferred_descriptions(
+    sample_states: Dict, c_major_tonality: Tonality
+) -> None:
+    """Tests that render() replaces callable step descriptions with the text they produce."""
+    path = KripkePath()
+    path.add_step(sample_states["s_t"], c_major_tonality, "start")
+    path.add_step(sample_states["s_d"], c_major_tonality, lambda: "to dominant")
+
+    assert path.render() is path
+    assert path.explanations == ["start", "to dominant"]
+
+
+def test_kripke_path_clone_shares_steps_and_stays_independent(
+    sample_states: Dict, c_major_tonality: Tonality
+) -> None:
+    """Tests that clones share their prefix but are unaffected by later changes to the original."""
+    path = KripkePath()
+    path.add_step(sample_states["s_t"], c_major_tonality, "start")
+    path.add_step(sample_states["s_d"], c_major_tonality, "to dominant")
+    frozen = path.clone()
+
+    assert frozen.last_step is path.last_step
+
+    path.pop_step()
+    path.add_step(sample_states["s_sd"], c_major_tonality, "to subdominant")
+
+    assert frozen.states == [sample_states["s_t"], sample_states["s_d"]]
+    assert path.states == [sample_states["s_t"], sample_states["s_sd"]]
+    assert frozen.get_length() == path.get_length() == 2
+    assert "DOMINANT in C Major" in frozen.to_readable_format()
+
+
+def test_tonality_function_mask(c_major_tonality: Tonality) -> None:
+    """Tests that function_mask() sets one bit per fulfilled function and memoizes the answer."""
+    tonic_bit = 1 << TonalFunction.TONIC.value
+
+    assert c_major_tonality.function_mask(Chord("C")) == tonic_bit
+    assert c_major_tonality.function_mask(Chord("F#")) == 0
+    assert c_major_tonality._function_masks == {"C": tonic_bit, "F#": 0}
+
+
+def test_tonality_function_mask_memo_is_bounded(
+    c_major_tonality: Tonality, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that the function_mask() memo is emptied when full instead of growing."""
+    monkeypatch.setattr("core.domain.models.FUNCTION_MASK_CACHE_SIZE", 3)
+    for name in ("C", "G", "F", "Am"):
+        c_major_tonality.function_mask(Chord(name))
+
+    assert list(c_major_tonality._function_masks) == ["Am"]
+    assert c_major_tonality.function_mask(Chord("C")) == 1 << TonalFunction.TONIC.value
+
+
+def test_tonality_fifths_distance(c_major_tonality: Tonality) -> None:
+    """Tests circle-of-fifths positions, with minor keys placed at their relative major."""
+    a_minor = Tonality(tonality_name="A minor", function_to_chords_map={})
+    e_minor = Tonality(tonality_name="E minor", function_to_chords_map={})
+    bb_major = Tonality(tonality_name="Bb Major", function_to_chords_map={})
+    f_sharp_major = Tonality(tonality_name="F# Major", function_to_chords_map={})
+
+    assert c_major_tonality.circle_of_fifths_position == 0
+    assert e_minor.circle_of_fifths_position == 1
+    assert bb_major.circle_of_fifths_position == 10
+    assert c_major_tonality.fifths_distance(a_minor) == 0
+    assert c_major_tonality.fifths_distance(e_minor) == 1
+    assert c_major_tonality.fifths_distance(bb_major) == 2
+    assert c_major_tonality.fifths_distance(f_sharp_major) == 6
+
+
+def test_chord_and_tonality_names_are_interned() -> None:
+    """Tests that equal names built at runtime share one string object."""
+    suffix = "m"
+    assert Chord("C" + suffix).name is Chord("Cm").name
+
+    mode = "Major"
+    built = Tonality(tonality_name="C " + mode, function_to_chords_map={})
+    assert (
+        built.tonality_name
+        is Tonality(tonality_name="C Major", function_to_chords_map={}).tonality_name
+    )
+
+
+def test_tonality_chord_fulfills_function_reads_function_mask(c_major_tonality: Tonality) -> None:
+    """Tests that function checks are answered from the memoized mask of the chord."""
+    assert c_major_tonality.chord_fulfills_function(Chord("G7"), TonalFunction.DOMINANT)
+    assert "G7" in c_major_tonality._function_masks
+
+    c_major_tonality._function_masks["G7"] = 0
+    assert not c_major_tonality.chord_fulfills_function(Chord("G7"), TonalFunction.DOMINANT)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="slotted dataclasses need Python 3.10")
+def test_explanation_steps_have_no_instance_dict(
+    sample_detailed_step: DetailedExplanationStep,
+) -> None:
+    """Tests that explanations and their steps are slotted and still copy correctly."""
+    explanation = Explanation(steps=[sample_detailed_step])
+
+    assert not hasattr(sample_detailed_step, "__dict__")
+    assert not hasattr(explanation, "__dict__")
+    assert explanation.clone().steps[0] == sample_detailed_step
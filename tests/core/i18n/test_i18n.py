@@ -2,6 +2,8 @@
 Tests for the internationalization (i18n) system.
 """
 
+import contextvars
+
 import pytest
 
 from core.i18n import LocaleManager, T, get_translator
@@ -55,6 +57,24 @@ class TestTranslator:
             # Should fallback to the key itself since it doesn't exist in any language
             assert result == "nonexistent.key"
 
+    def test_resolved_templates_are_reused_per_locale(self) -> None:
+        """Test that a key resolves once per locale and still formats per call."""
+        translator = get_translator()
+        with locale_manager.locale_context("en"):
+            assert T("analysis.rules.failure") == T("analysis.rules.failure")
+            assert ("en", "analysis.rules.failure") in translator._templates
+            result = T(
+                "analysis.messages.chord_fulfills_function",
+                chord_name="G",
+                function_name="DOMINANT",
+                tonality_name="C Major",
+            )
+            assert result == "Chord 'G' fulfills function 'DOMINANT' in 'C Major'."
+        with locale_manager.locale_context("pt_br"):
+            assert T("api.welcome_message").startswith("Bem-vindo")
+        with locale_manager.locale_context("en"):
+            assert T("api.welcome_message").startswith("Welcome")
+
     def test_nested_keys(self) -> None:
         """Test nested key access."""
         with locale_manager.locale_context("en"):
@@ -97,6 +117,14 @@ class TestLocaleManager:
         # Should return to English
         assert locale_manager.current_locale == "en"
 
+    def test_locale_does_not_leak_between_contexts(self) -> None:
+        """Test that a locale set in another context, such as another request, is not seen here."""
+        context = contextvars.copy_context()
+        context.run(locale_manager.set_locale, "pt_br")
+
+        assert context.run(lambda: locale_manager.current_locale) == "pt_br"
+        assert locale_manager.current_locale == "en"
+
     def test_accept_language_parsing(self) -> None:
         """Test parsing of Accept-Language header."""
         # Test Portuguese preference
@@ -1,6 +1,6 @@
 # tonalogy-api/tests/core/logic/test_kripke_evaluator.py
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import pytest
 
@@ -9,12 +9,13 @@ from core.domain.models import (
     Chord,
     DetailedExplanationStep,
     Explanation,
+    KripkePath,
     KripkeState,
     KripkeStructureConfig,
     TonalFunction,
     Tonality,
 )
-from core.logic.kripke_evaluator import SatisfactionEvaluator
+from core.logic.kripke_evaluator import MAX_RECURSION_DEPTH, ChordTables, SatisfactionEvaluator
 
 # --- Fixtures to create a consistent test environment ---
 # These fixtures provide reusable objects for our tests.
@@ -271,3 +272,483 @@ def test_tonicization_pivot_success_complex_progression(
         if "Re-anchor" in step.formal_rule_applied or "Eq.4B" in step.formal_rule_applied
     ]
     assert len(reanchor_steps) > 0, "Should have at least one re-anchor step"
+
+
+def test_relation_with_equal_but_distinct_states(
+    tonic_state: KripkeState,
+    dominant_state: KripkeState,
+    subdominant_state: KripkeState,
+    c_major_tonality: Tonality,
+) -> None:
+    """
+    Tests a configuration whose accessibility relation holds states equal to, but not the same
+    objects as, those in `states`, as when it is built separately or deserialized.
+    """
+
+    # GIVEN: a relation made of fresh copies of the configuration's states
+    def copy_of(state: KripkeState) -> KripkeState:
+        return KripkeState(state.state_id, state.associated_tonal_function)
+
+    config = KripkeStructureConfig(
+        states={tonic_state, dominant_state, subdominant_state},
+        initial_states={tonic_state},
+        final_states={dominant_state, subdominant_state},
+        accessibility_relation=[
+            (copy_of(tonic_state), copy_of(dominant_state)),
+            (copy_of(tonic_state), copy_of(subdominant_state)),
+            (copy_of(dominant_state), copy_of(subdominant_state)),
+        ],
+    )
+    evaluator = SatisfactionEvaluator(config, [c_major_tonality], c_major_tonality)
+
+    # WHEN: the inverted progression [C, G, F] is evaluated from the tonic
+    success, explanation = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=c_major_tonality,
+        current_state=tonic_state,
+        remaining_chords=[Chord("C"), Chord("G"), Chord("F")],
+        recursion_depth=0,
+        parent_explanation=Explanation(),
+    )
+
+    # THEN: it succeeds along s_t -> s_d -> s_sd, as with a configuration built from one set
+    assert success is True
+    processed = [step for step in explanation.steps if step.processed_chord is not None]
+    assert [step.processed_chord for step in processed] == [Chord("C"), Chord("G"), Chord("F")]
+    assert [step.evaluated_functional_state for step in processed] == [
+        tonic_state,
+        dominant_state,
+        subdominant_state,
+    ]
+
+
+def test_states_listed_only_in_the_relation(
+    tonic_state: KripkeState,
+    dominant_state: KripkeState,
+    c_major_tonality: Tonality,
+) -> None:
+    """
+    Tests a relation reaching a state missing from `states`, through a distinct object in each
+    pair, with the analysis starting from a copy of the tonic state.
+    """
+
+    # GIVEN: the subdominant state appears only in the relation, once per pair
+    def subdominant() -> KripkeState:
+        return KripkeState("s_sd", TonalFunction.SUBDOMINANT)
+
+    config = KripkeStructureConfig(
+        states={tonic_state, dominant_state},
+        initial_states={tonic_state},
+        final_states={dominant_state},
+        accessibility_relation=[
+            (tonic_state, dominant_state),
+            (tonic_state, subdominant()),
+            (dominant_state, subdominant()),
+        ],
+    )
+    evaluator = SatisfactionEvaluator(config, [c_major_tonality], c_major_tonality)
+
+    # WHEN: [C, G, F] is evaluated from a copy of the tonic state
+    success, explanation = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=c_major_tonality,
+        current_state=KripkeState(tonic_state.state_id, TonalFunction.TONIC),
+        remaining_chords=[Chord("C"), Chord("G"), Chord("F")],
+        recursion_depth=0,
+        parent_explanation=Explanation(),
+    )
+
+    # THEN: the subdominant is reached from the dominant and explains the last chord
+    assert success is True
+    processed = [step for step in explanation.steps if step.processed_chord is not None]
+    assert [step.processed_chord for step in processed] == [Chord("C"), Chord("G"), Chord("F")]
+    assert processed[-1].evaluated_functional_state == subdominant()
+
+
+def _processed_steps(explanation: Explanation) -> List[Tuple[Chord, str, str]]:
+    """The (chord, state id, tonality name) of each step of an explanation that processed a chord."""
+    return [
+        (
+            step.processed_chord,
+            step.evaluated_functional_state.state_id,
+            step.tonality_used_in_step.tonality_name,
+        )
+        for step in explanation.flatten().steps
+        if step.processed_chord is not None
+        and step.evaluated_functional_state is not None
+        and step.tonality_used_in_step is not None
+    ]
+
+
+def test_repeated_failing_query_returns_the_callers_explanation(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that asking the same failing question twice fails both times, and that the second
+    answer carries the caller's own explanation instead of one left over from the first.
+    """
+    # GIVEN: an evaluator and a query that starts at the depth limit, so no branch can succeed
+    evaluator = SatisfactionEvaluator(aragao_kripke_config, [c_major_tonality], c_major_tonality)
+    progression: List[Chord] = [Chord("G")]
+
+    # WHEN: the evaluation is executed twice
+    first_success, _ = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=c_major_tonality,
+        current_state=tonic_state,
+        remaining_chords=progression,
+        recursion_depth=MAX_RECURSION_DEPTH,
+        parent_explanation=Explanation(),
+    )
+    second_parent = Explanation()
+    second_parent.add_step(formal_rule_applied="Start", observation="Second query")
+    second_success, second_explanation = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=c_major_tonality,
+        current_state=tonic_state,
+        remaining_chords=progression,
+        recursion_depth=MAX_RECURSION_DEPTH,
+        parent_explanation=second_parent,
+    )
+
+    # THEN: both fail and the second explanation is the caller's
+    assert first_success is False and second_success is False
+    assert second_explanation.steps == second_parent.steps
+
+
+def test_chord_outside_the_original_tonality_reanchors_once(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that a chord the original tonality cannot explain is explained in another tonality
+    after a single re-anchor step.
+    """
+    # GIVEN: an evaluator whose original tonality cannot explain the progression [A7]
+    evaluator = SatisfactionEvaluator(
+        aragao_kripke_config, [c_major_tonality, d_minor_tonality], c_major_tonality
+    )
+    initial_path = KripkePath()
+    initial_path.add_step(tonic_state, c_major_tonality, "Start")
+
+    # WHEN: the progression is evaluated
+    success, explanation, path = evaluator.evaluate_satisfaction_with_path(
+        initial_path, [Chord("A7")], 0, Explanation()
+    )
+
+    # THEN: it is explained in D minor after a single re-anchor step
+    assert success is True
+    assert path is not None and path.tonalities[0].tonality_name == "D minor"
+    flat = explanation.flatten()
+    assert sum(step.processed_chord is None for step in flat.steps[:-1]) == 1
+    assert _processed_steps(explanation) == [(Chord("A7"), "s_d", "D minor")]
+    # AND: the caller's path is left as it was
+    assert initial_path.get_length() == 1
+
+
+def test_repeated_query_gets_the_same_answer(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that a progression evaluated again on the same evaluator, which then answers from
+    its cache, gets the same analysis as the first time.
+    """
+    # GIVEN: an evaluator and a progression that repeats a chord
+    evaluator = SatisfactionEvaluator(aragao_kripke_config, [c_major_tonality], c_major_tonality)
+    progression = [Chord("C"), Chord("G"), Chord("C")]
+
+    # WHEN: the progression is evaluated twice
+    results = [
+        evaluator.evaluate_satisfaction_recursive(
+            current_tonality=c_major_tonality,
+            current_state=tonic_state,
+            remaining_chords=progression,
+            recursion_depth=0,
+            parent_explanation=Explanation(),
+        )
+        for _ in range(2)
+    ]
+
+    # THEN: both succeed with the same analysis
+    (first_success, first), (second_success, second) = results
+    assert first_success is True and second_success is True
+    assert _processed_steps(first) == _processed_steps(second)
+    assert [chord for chord, _, _ in _processed_steps(first)][:3] == progression
+
+
+def test_tonality_with_a_known_name_is_analyzed_as_the_known_one(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that a tonality object sharing its name with an available one, here an empty copy,
+    is analyzed with the harmonic field of the available one.
+    """
+    # GIVEN: an evaluator given an empty twin of C Major as original and current tonality
+    twin = Tonality(tonality_name="C Major", function_to_chords_map={})
+    evaluator = SatisfactionEvaluator(
+        aragao_kripke_config, [c_major_tonality, d_minor_tonality, twin], twin
+    )
+
+    # WHEN: a C Major progression is evaluated in the twin
+    success, explanation = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=twin,
+        current_state=tonic_state,
+        remaining_chords=[Chord("C"), Chord("G")],
+        recursion_depth=0,
+        parent_explanation=Explanation(),
+    )
+
+    # THEN: it is explained in C Major, with the chords of the available tonality
+    assert success is True
+    assert _processed_steps(explanation) == [
+        (Chord("C"), "s_t", "C Major"),
+        (Chord("G"), "s_d", "C Major"),
+    ]
+    assert all(step.tonality_used_in_step is not twin for step in explanation.flatten().steps)
+
+
+def test_answer_does_not_depend_on_the_order_of_available_tonalities(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that re-anchoring, which tries tonalities by their affinity with the progression,
+    reports the same analysis whatever order the tonalities are given in.
+    """
+    # GIVEN: a third tonality and a progression mostly made of D minor chords
+    g_major_tonality = Tonality(
+        tonality_name="G Major",
+        function_to_chords_map={
+            TonalFunction.TONIC: {Chord("G"): "natural"},
+            TonalFunction.DOMINANT: {Chord("D"): "natural"},
+            TonalFunction.SUBDOMINANT: {Chord("C"): "natural", Chord("Am"): "natural"},
+        },
+    )
+    progression = [Chord("Dm"), Chord("A7"), Chord("Gm"), Chord("C")]
+    orders = [
+        [c_major_tonality, g_major_tonality, d_minor_tonality],
+        [d_minor_tonality, g_major_tonality, c_major_tonality],
+    ]
+
+    # WHEN: it is evaluated by evaluators given the tonalities in different orders
+    results = [
+        SatisfactionEvaluator(
+            aragao_kripke_config, tonalities, c_major_tonality
+        ).evaluate_satisfaction_recursive(
+            current_tonality=c_major_tonality,
+            current_state=tonic_state,
+            remaining_chords=progression,
+            recursion_depth=0,
+            parent_explanation=Explanation(),
+        )
+        for tonalities in orders
+    ]
+
+    # THEN: both succeed with the same analysis
+    (first_success, first), (second_success, second) = results
+    assert first_success is True and second_success is True
+    assert _processed_steps(first) == _processed_steps(second)
+
+
+def test_ranked_tonalities_do_not_change_the_answer(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that ranking the tonalities, which orders the pivot candidates, leaves the analysis of
+    a progression with several pivot candidates unchanged.
+    """
+    # GIVEN: two tonalities with C as tonic, only one of them ranked
+    c_mixolydian_tonality = Tonality(
+        tonality_name="C Mixolydian",
+        function_to_chords_map={
+            TonalFunction.TONIC: {Chord("C"): "natural"},
+            TonalFunction.DOMINANT: {Chord("Gm"): "natural"},
+            TonalFunction.SUBDOMINANT: {Chord("F"): "natural"},
+        },
+    )
+    tonalities = [c_major_tonality, d_minor_tonality, c_mixolydian_tonality]
+    progression = [Chord("C"), Chord("Gm"), Chord("C")]
+
+    # WHEN: the progression is evaluated with and without a ranking
+    results = [
+        SatisfactionEvaluator(
+            aragao_kripke_config, tonalities, c_major_tonality
+        ).evaluate_satisfaction_recursive(
+            current_tonality=c_major_tonality,
+            current_state=tonic_state,
+            remaining_chords=progression,
+            recursion_depth=0,
+            parent_explanation=Explanation(),
+            ranked_tonalities=ranked,
+        )
+        for ranked in (None, [c_major_tonality, d_minor_tonality])
+    ]
+
+    # THEN: both succeed with the same analysis
+    (unranked_success, unranked), (ranked_success, ranked_explanation) = results
+    assert unranked_success is True and ranked_success is True
+    assert _processed_steps(unranked) == _processed_steps(ranked_explanation)
+
+
+def test_evaluators_sharing_chord_tables_agree_with_separate_ones(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """Tests that evaluators given the same ChordTables answer as evaluators with their own."""
+    # GIVEN: two evaluators sharing their chord tables and two with tables of their own
+    tables = ChordTables()
+    tonalities = [c_major_tonality, d_minor_tonality]
+    progression = [Chord("F"), Chord("C"), Chord("A7"), Chord("Dm")]
+
+    def analyze(
+        original: Tonality, chord_tables: Optional[ChordTables]
+    ) -> Tuple[bool, Explanation]:
+        evaluator = SatisfactionEvaluator(aragao_kripke_config, tonalities, original, chord_tables)
+        return evaluator.evaluate_satisfaction_recursive(
+            current_tonality=original,
+            current_state=tonic_state,
+            remaining_chords=progression,
+            recursion_depth=0,
+            parent_explanation=Explanation(),
+        )
+
+    # WHEN: each pair analyzes the progression from C Major and from D minor
+    shared = [analyze(t, tables) for t in tonalities]
+    separate = [analyze(t, None) for t in tonalities]
+
+    # THEN: the answers match
+    for (shared_success, shared_explanation), (separate_success, separate_explanation) in zip(
+        shared, separate
+    ):
+        assert shared_success is separate_success
+        assert _processed_steps(shared_explanation) == _processed_steps(separate_explanation)
+
+
+def test_chord_tables_stay_bounded(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Tests that shared chord tables, whose chord names come from requests, never hold more than
+    CHORD_TABLE_SIZE names, and that analyses still succeed once they are emptied.
+    """
+    # GIVEN: evaluators sharing chord tables limited to two chord names
+    monkeypatch.setattr("core.logic.kripke_evaluator.CHORD_TABLE_SIZE", 2)
+    tables = ChordTables()
+    tonalities = [c_major_tonality, d_minor_tonality]
+
+    # WHEN: progressions with many different chords are analyzed
+    results = [
+        SatisfactionEvaluator(
+            aragao_kripke_config, tonalities, c_major_tonality, tables
+        ).evaluate_satisfaction_recursive(
+            current_tonality=c_major_tonality,
+            current_state=tonic_state,
+            remaining_chords=progression,
+            recursion_depth=0,
+            parent_explanation=Explanation(),
+        )
+        for progression in (
+            [Chord("C"), Chord("G"), Chord("F")],
+            [Chord("Dm"), Chord("A7"), Chord("Gm"), Chord("F#")],
+            [Chord("C"), Chord("G"), Chord("F")],
+        )
+    ]
+
+    # THEN: no table grew past the limit and the repeated progression is still explained
+    assert all(
+        len(table) <= 2
+        for table in (
+            tables.tonics_containing,
+            tables.dominants_containing,
+            tables.tonalities_supporting,
+        )
+    )
+    assert results[2][0] is True and results[0][0] is True
+
+
+def test_search_expands_each_subproblem_a_bounded_number_of_times(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that a failing search stays polynomial: nodes are (position, tonality, state), and
+    each is expanded at most twice thanks to the success cache and the failure memo.
+    """
+    # GIVEN: an evaluator and a long progression that needs more steps than the depth limit
+    # leaves when the search starts at depth 10
+    evaluator = SatisfactionEvaluator(
+        aragao_kripke_config, [c_major_tonality, d_minor_tonality], c_major_tonality
+    )
+    progression = [Chord("C"), Chord("F"), Chord("Dm"), Chord("A7")] * 3 + [Chord("Gm")]
+    expanded = 0
+    original_continuations = evaluator._get_possible_continuations
+
+    def counting_continuations(*args, **kwargs):  # type: ignore[no-untyped-def]
+        nonlocal expanded
+        expanded += 1
+        return original_continuations(*args, **kwargs)
+
+    evaluator._get_possible_continuations = counting_continuations  # type: ignore[method-assign]
+
+    # WHEN: the evaluation is executed
+    success, _ = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=c_major_tonality,
+        current_state=tonic_state,
+        remaining_chords=progression,
+        recursion_depth=10,
+        parent_explanation=Explanation(),
+    )
+
+    # THEN: it fails after expanding at most twice the number of distinct nodes
+    assert success is False
+    nodes = len(progression) * len(evaluator.all_available_tonalities) * 3
+    assert 0 < expanded <= 2 * nodes
+
+
+def test_unexplained_chord_fails_without_searching(
+    aragao_kripke_config: KripkeStructureConfig,
+    c_major_tonality: Tonality,
+    d_minor_tonality: Tonality,
+    tonic_state: KripkeState,
+) -> None:
+    """
+    Tests that a progression with a chord no tonality explains fails before any subproblem is
+    opened, returning the caller's explanation.
+    """
+    # GIVEN: an evaluator and a progression whose last chord belongs to no tonality
+    evaluator = SatisfactionEvaluator(
+        aragao_kripke_config, [c_major_tonality, d_minor_tonality], c_major_tonality
+    )
+    parent = Explanation()
+    parent.add_step(formal_rule_applied="Start", observation="Query")
+
+    # WHEN: the evaluation is executed
+    success, explanation = evaluator.evaluate_satisfaction_recursive(
+        current_tonality=c_major_tonality,
+        current_state=tonic_state,
+        remaining_chords=[Chord("C"), Chord("Dm"), Chord("F#")],
+        recursion_depth=0,
+        parent_explanation=parent,
+    )
+
+    # THEN: it fails with the caller's explanation
+    assert success is False
+    assert explanation.steps == parent.steps
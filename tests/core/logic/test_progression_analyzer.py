@@ -1,9 +1,12 @@
-from typing import Any
-from unittest.mock import MagicMock
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Tuple
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from core.domain.models import Chord, Explanation, Tonality
+from core.domain.models import Chord, Explanation, TonalFunction, Tonality
 from core.logic.progression_analyzer import ProgressionAnalyzer
 
 # We'll use fixtures for the mocks. In your real project, the fixtures for
@@ -137,3 +140,174 @@ def test_check_progression_handles_empty_sequence(
     # THEN: the result is failure and the explanation reflects the error
     assert success is False
     assert "empty" in explanation.steps[0].observation.lower()
+
+
+def test_check_progression_reuses_result_for_repeated_request(
+    mock_kripke_config: MagicMock, c_major_tonality_mock: MagicMock
+) -> None:
+    """
+    Verifies that repeating an analysis does not search again and returns an independent copy.
+    """
+    mock_evaluator_instance = MagicMock()
+    mock_evaluator_instance.evaluate_satisfaction_recursive.return_value = (True, Explanation())
+    with patch(
+        "core.logic.progression_analyzer.SatisfactionEvaluator",
+        return_value=mock_evaluator_instance,
+    ) as evaluator_class:
+        analyzer = ProgressionAnalyzer(mock_kripke_config, [c_major_tonality_mock])
+        progression = [Chord("C"), Chord("G7"), Chord("C")]
+
+        first_success, first_explanation = analyzer.check_tonal_progression(
+            progression, [c_major_tonality_mock]
+        )
+        second_success, second_explanation = analyzer.check_tonal_progression(
+            list(progression), [c_major_tonality_mock]
+        )
+
+    assert first_success is second_success is True
+    assert evaluator_class.call_count == 1
+    assert second_explanation is not first_explanation
+    assert second_explanation.steps == first_explanation.steps
+
+
+def test_check_progression_cache_evicts_least_recently_used(
+    mock_kripke_config: MagicMock, c_major_tonality_mock: MagicMock
+) -> None:
+    """
+    Verifies that a full cache drops the least recently used analysis and that clear_cache()
+    forgets every analysis.
+    """
+    mock_evaluator_instance = MagicMock()
+    mock_evaluator_instance.evaluate_satisfaction_recursive.return_value = (True, Explanation())
+    with (
+        patch(
+            "core.logic.progression_analyzer.SatisfactionEvaluator",
+            return_value=mock_evaluator_instance,
+        ) as evaluator_class,
+        patch("core.logic.progression_analyzer.RESULT_CACHE_SIZE", 2),
+    ):
+        analyzer = ProgressionAnalyzer(mock_kripke_config, [c_major_tonality_mock])
+        first, second, third = [Chord("C")], [Chord("G"), Chord("C")], [Chord("F"), Chord("C")]
+
+        analyzer.check_tonal_progression(first, [c_major_tonality_mock])
+        analyzer.check_tonal_progression(second, [c_major_tonality_mock])
+        analyzer.check_tonal_progression(first, [c_major_tonality_mock])  # hit, now most recent
+        analyzer.check_tonal_progression(third, [c_major_tonality_mock])  # evicts `second`
+        assert evaluator_class.call_count == 3
+
+        analyzer.check_tonal_progression(first, [c_major_tonality_mock])
+        assert evaluator_class.call_count == 3
+        analyzer.check_tonal_progression(second, [c_major_tonality_mock])
+        assert evaluator_class.call_count == 4
+
+        analyzer.clear_cache()
+        analyzer.check_tonal_progression(first, [c_major_tonality_mock])
+        assert evaluator_class.call_count == 5
+
+
+def test_check_progression_cache_is_safe_under_concurrent_requests(
+    mock_kripke_config: MagicMock, c_major_tonality_mock: MagicMock
+) -> None:
+    """
+    Verifies that analyses requested from several threads at once, as the API's worker threads
+    do, all get their result while a small cache keeps evicting entries.
+    """
+
+    def slow_evaluation(*args: Any, **kwargs: Any) -> Tuple[bool, Explanation]:
+        time.sleep(0.001)  # Lets the other threads run between lookup and insertion
+        return True, Explanation()
+
+    mock_evaluator_instance = MagicMock()
+    mock_evaluator_instance.evaluate_satisfaction_recursive.side_effect = slow_evaluation
+    # Switching threads as often as possible opens the gaps between the cache's dict operations.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with (
+            patch(
+                "core.logic.progression_analyzer.SatisfactionEvaluator",
+                return_value=mock_evaluator_instance,
+            ),
+            patch("core.logic.progression_analyzer.RESULT_CACHE_SIZE", 2),
+        ):
+            analyzer = ProgressionAnalyzer(mock_kripke_config, [c_major_tonality_mock])
+            progressions = [[Chord(name), Chord("C")] for name in ("G", "F", "Am", "Dm", "Em")]
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(
+                    executor.map(
+                        lambda chords: analyzer.check_tonal_progression(
+                            chords, [c_major_tonality_mock]
+                        ),
+                        progressions * 200,
+                    )
+                )
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert len(results) == len(progressions) * 200
+    assert all(success for success, _ in results)
+
+
+def test_check_progression_rejects_non_tonic_ending_without_evaluator(
+    mock_kripke_config: MagicMock, c_major_tonality_mock: MagicMock
+) -> None:
+    """
+    Verifies that a progression whose last chord is not a tonic is rejected before any
+    evaluator is built.
+    """
+    c_major_tonality_mock.function_mask.return_value = 0
+    with patch("core.logic.progression_analyzer.SatisfactionEvaluator") as evaluator_class:
+        analyzer = ProgressionAnalyzer(mock_kripke_config, [c_major_tonality_mock])
+        success, explanation = analyzer.check_tonal_progression(
+            [Chord("C"), Chord("G")], [c_major_tonality_mock]
+        )
+
+    assert success is False
+    assert "G" in explanation.steps[-1].observation
+    evaluator_class.assert_not_called()
+
+
+def test_check_progression_resolves_tonic_state_once(
+    mock_kripke_config: MagicMock, c_major_tonality_mock: MagicMock
+) -> None:
+    """
+    Verifies that the initial tonic state is looked up when the analyzer is built, and that a
+    configuration without one fails every analysis.
+    """
+    mock_kripke_config.get_state_by_tonal_function.return_value = None
+    analyzer = ProgressionAnalyzer(mock_kripke_config, [c_major_tonality_mock])
+
+    for chords in ([Chord("C")], [Chord("G"), Chord("C")]):
+        success, explanation = analyzer.check_tonal_progression(chords, [c_major_tonality_mock])
+        assert success is False
+        assert len(explanation.steps) == 1
+
+    mock_kripke_config.get_state_by_tonal_function.assert_called_once()
+
+
+def test_check_progression_promotes_first_candidate_closing_on_tonic(
+    mock_kripke_config: MagicMock,
+    c_major_tonality_mock: MagicMock,
+    g_major_tonality_mock: MagicMock,
+) -> None:
+    """
+    Verifies that when the final chord is not a tonic of the first candidate, the analysis
+    starts from the best ranked candidate in which it is.
+    """
+    c_major_tonality_mock.function_mask.return_value = 0
+    g_major_tonality_mock.function_mask.return_value = 1 << TonalFunction.TONIC.value
+    candidates: List[Any] = [c_major_tonality_mock, g_major_tonality_mock]
+    with patch("core.logic.progression_analyzer.SatisfactionEvaluator") as evaluator_class:
+        evaluator_class.return_value.evaluate_satisfaction_recursive.return_value = (
+            True,
+            Explanation(),
+        )
+        analyzer = ProgressionAnalyzer(mock_kripke_config, candidates)
+        success, _ = analyzer.check_tonal_progression([Chord("D"), Chord("G")], candidates)
+
+    assert success is True
+    assert evaluator_class.call_args.args[2] is g_major_tonality_mock
+    call = evaluator_class.return_value.evaluate_satisfaction_recursive.call_args
+    assert call.kwargs["current_tonality"] is g_major_tonality_mock
+    assert call.kwargs["ranked_tonalities"] == candidates
@@ -340,10 +340,10 @@ class TestHarmonicGraph:
         assert len(harmonic_graph.existing_connections) == 0
 
     @patch("visualizer.harmonic_graph.SvgFactory")
-    def test_render_calls_svg_factory(
+    def test_render_png_returns_image_and_cleans_up(
         self, mock_svg_factory_class: MagicMock, harmonic_graph: HarmonicGraph
     ) -> None:
-        """Test that render method calls svg_factory appropriately."""
+        """Test that render_png returns the rendered bytes and removes the node images."""
         # GIVEN
         mock_svg_factory_instance = MagicMock()
         mock_svg_factory_class.return_value = mock_svg_factory_instance
@@ -351,17 +351,30 @@ class TestHarmonicGraph:
         # Recreate harmonic_graph to use the mocked SvgFactory
         harmonic_graph = HarmonicGraph(theme=harmonic_graph.theme, temp_dir=Path("/tmp"))
 
-        output_filename = Path("/fake/output/path")
-
         # WHEN
-        with patch.object(harmonic_graph.dot, "render") as mock_render:
-            # The render method adds .png extension, so mock accordingly
-            mock_render.return_value = str(output_filename) + ".png"
-            result = harmonic_graph.render(output_filename)
+        with patch.object(harmonic_graph.dot, "pipe", return_value=b"\x89PNG") as mock_pipe:
+            result = harmonic_graph.render_png()
 
         # THEN
-        assert result == str(output_filename) + ".png"
-        mock_render.assert_called_once()
+        assert result == b"\x89PNG"
+        mock_pipe.assert_called_once_with(format="png")
+        mock_svg_factory_instance.cleanup_files.assert_called_once_with()
+
+    @patch("visualizer.harmonic_graph.SvgFactory")
+    def test_render_png_propagates_errors_and_cleans_up(
+        self, mock_svg_factory_class: MagicMock, harmonic_graph: HarmonicGraph
+    ) -> None:
+        """Test that a rendering error reaches the caller and the node images are still removed."""
+        # GIVEN
+        mock_svg_factory_instance = MagicMock()
+        mock_svg_factory_class.return_value = mock_svg_factory_instance
+        harmonic_graph = HarmonicGraph(theme=harmonic_graph.theme, temp_dir=Path("/tmp"))
+
+        # WHEN / THEN
+        with patch.object(harmonic_graph.dot, "pipe", side_effect=RuntimeError("dot failed")):
+            with pytest.raises(RuntimeError, match="dot failed"):
+                harmonic_graph.render_png()
+        mock_svg_factory_instance.cleanup_files.assert_called_once_with()
 
     def test_existing_connections_tracking(self, harmonic_graph: HarmonicGraph) -> None:
         """Test that existing connections are properly tracked."""
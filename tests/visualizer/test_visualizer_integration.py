@@ -101,14 +101,14 @@ class TestVisualizerIntegration:
         ):
             with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
                 mock_graph = MagicMock()
-                mock_graph.render.return_value = "/fake/path/simple_progression.png"
+                mock_graph.render_png.return_value = b"\x89PNG simple_progression"
                 mock_graph_class.return_value = mock_graph
 
                 # WHEN
                 result = service.create_graph_from_analysis(analysis_data)
 
                 # THEN
-                assert result == "/fake/path/simple_progression.png"
+                assert result == b"\x89PNG simple_progression"
                 # Verify that only primary chords were added (no secondary tonalities)
                 assert mock_graph.add_primary_chord.call_count == 3
                 assert mock_graph.add_secondary_chord_with_theme.call_count == 0
@@ -161,14 +161,14 @@ class TestVisualizerIntegration:
         ):
             with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
                 mock_graph = MagicMock()
-                mock_graph.render.return_value = "/fake/path/pivot_progression.png"
+                mock_graph.render_png.return_value = b"\x89PNG pivot_progression"
                 mock_graph_class.return_value = mock_graph
 
                 # WHEN
                 result = service.create_graph_from_analysis(analysis_data)
 
                 # THEN
-                assert result == "/fake/path/pivot_progression.png"
+                assert result == b"\x89PNG pivot_progression"
                 # Verify that secondary tonality themes were used
                 assert mock_graph.add_secondary_chord_with_theme.call_count > 0
 
@@ -228,14 +228,14 @@ class TestVisualizerIntegration:
         ):
             with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
                 mock_graph = MagicMock()
-                mock_graph.render.return_value = "/fake/path/secondary_dominant.png"
+                mock_graph.render_png.return_value = b"\x89PNG secondary_dominant"
                 mock_graph_class.return_value = mock_graph
 
                 # WHEN
                 result = service.create_graph_from_analysis(analysis_data)
 
                 # THEN
-                assert result == "/fake/path/secondary_dominant.png"
+                assert result == b"\x89PNG secondary_dominant"
                 # Verify that secondary chord with specific theme was used
                 assert mock_graph.add_secondary_chord_with_theme.call_count > 0
 
@@ -280,14 +280,14 @@ class TestVisualizerIntegration:
         ):
             with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
                 mock_graph = MagicMock()
-                mock_graph.render.return_value = "/fake/path/minor_progression.png"
+                mock_graph.render_png.return_value = b"\x89PNG minor_progression"
                 mock_graph_class.return_value = mock_graph
 
                 # WHEN
                 result = service.create_graph_from_analysis(analysis_data)
 
                 # THEN
-                assert result == "/fake/path/minor_progression.png"
+                assert result == b"\x89PNG minor_progression"
                 # Verify that dashed style was used for minor tonality
                 add_primary_calls = mock_graph.add_primary_chord.call_args_list
                 for call in add_primary_calls:
@@ -353,12 +353,12 @@ class TestVisualizerIntegration:
 
             with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
                 mock_graph = MagicMock()
-                mock_graph.render.return_value = "/fake/path/test.png"
+                mock_graph.render_png.return_value = b"\x89PNG test"
                 mock_graph_class.return_value = mock_graph
 
                 # This should not raise an exception
                 result = service.create_graph_from_analysis(analysis_data_template)
-                assert result == "/fake/path/test.png"
+                assert result == b"\x89PNG test"
 
     def test_shape_mapping(self) -> None:
         """Test that chord functions are correctly mapped to shapes."""
@@ -395,7 +395,7 @@ class TestVisualizerIntegration:
 
         with patch("api.services.visualizer_service.HarmonicGraph") as mock_graph_class:
             mock_graph = MagicMock()
-            mock_graph.render.return_value = "/fake/path/shapes.png"
+            mock_graph.render_png.return_value = b"\x89PNG shapes"
             mock_graph_class.return_value = mock_graph
 
             result = service.create_graph_from_analysis(analysis_data)
@@ -208,14 +208,10 @@ class HarmonicGraph:
                     from_node, to_node, style="dotted", arrowhead="none", color="#888888"
                 )
 
-    def render(self, filename: Path) -> str:
-        output_path = filename.with_suffix(".png")
+    def render_png(self) -> bytes:
+        """Renders the graph to PNG and returns the image in memory, without writing it to disk."""
         try:
-            self.dot.render(str(filename), view=False, cleanup=True, format="png")
-            return str(output_path)
-        except Exception as e:
-            print(f"Error generating graph: {e}")
-            raise
+            return bytes(self.dot.pipe(format="png"))
         finally:
             self.svg_factory.cleanup_files()
 